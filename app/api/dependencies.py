@@ -1,44 +1,85 @@
-from functools import lru_cache
-from typing import Generator
+from concurrent.futures import Executor
+from dataclasses import dataclass
+from typing import Any, AsyncGenerator, Dict, Optional
 
-from fastapi import Depends
-from sqlalchemy.orm import Session
+from fastapi import Depends, Request
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.config import Settings, get_settings
+from app.config import Settings
+from app.crewai_integration.agent import AdvisorCrewIntegration
+from app.interfaces.cache import ICacheService
 from app.models.database import get_db_session
+from app.services.analysis_pool import create_analysis_executor
 from app.services.analysis_service import CodeAnalysisService
 from app.services.cache_service import CacheService
 from app.services.code_analyzer import CodeAnalyzer
 from app.services.database_service import AnalysisHistoryService
 
 
-@lru_cache
-def get_code_analyzer() -> CodeAnalyzer:
-    return CodeAnalyzer()
+@dataclass
+class Services:
+    """Process-wide singletons shared by every request."""
 
+    analyzer: CodeAnalyzer
+    cache: ICacheService
+    settings: Settings
+    executor: Optional[Executor] = None
+    crew_integration: Optional[AdvisorCrewIntegration] = None
 
-@lru_cache
-def _build_cache_service(redis_url: str) -> CacheService:
-    return CacheService(redis_url)
 
+def build_services(settings: Settings) -> Services:
+    """Build the singletons stored on ``app.state.services`` at startup."""
+    executor = None
+    if settings.analysis_workers > 0:
+        executor = create_analysis_executor(settings.analysis_workers)
+    return Services(
+        analyzer=CodeAnalyzer(),
+        cache=CacheService(settings.redis_url),
+        settings=settings,
+        executor=executor,
+    )
 
-def get_cache_service(settings: Settings = Depends(get_settings)) -> CacheService:
-    return _build_cache_service(settings.redis_url)
 
+async def get_services(request: Request) -> Services:
+    # Dependências sem trabalho bloqueante são async: o FastAPI roda funções
+    # síncronas no threadpool, um salto de thread por dependência e requisição
+    return request.app.state.services
 
-def get_db() -> Generator[Session, None, None]:
-    yield from get_db_session()
 
+def get_crew_integration(services: Services) -> AdvisorCrewIntegration:
+    """Provide the CrewAI integration, built once from the injected settings."""
+    integration = services.crew_integration
+    if integration is None:
+        integration = services.crew_integration = AdvisorCrewIntegration(
+            services.settings, services.analyzer
+        )
+    return integration
 
-def get_database_service(db: Session = Depends(get_db)) -> AnalysisHistoryService:
-    """Provide database service instance."""
-    return AnalysisHistoryService(db)
 
+def get_crew_workflow(services: Services = Depends(get_services)) -> Dict[str, Any]:
+    """
+    Provide a fresh CrewAI workflow for each request.
 
-def get_analysis_service(
-    analyzer: CodeAnalyzer = Depends(get_code_analyzer),
-    cache: CacheService = Depends(get_cache_service),
-    db_service: AnalysisHistoryService = Depends(get_database_service),
+    Crew, agent and task are mutated during ``kickoff`` (task output, input
+    interpolation, executor state), so they are never shared between
+    concurrent requests; only the integration and its LLM client are reused.
+    """
+    return get_crew_integration(services).build_sample_workflow()
+
+
+async def get_db() -> AsyncGenerator[AsyncSession, None]:
+    async for db in get_db_session():
+        yield db
+
+
+async def get_analysis_service(
+    services: Services = Depends(get_services),
+    db: AsyncSession = Depends(get_db),
 ) -> CodeAnalysisService:
     """Provide analysis service instance."""
-    return CodeAnalysisService(analyzer, cache, db_service)
+    return CodeAnalysisService(
+        services.analyzer,
+        services.cache,
+        AnalysisHistoryService(db),
+        executor=services.executor,
+    )
@@ -1,67 +1,103 @@
 from __future__ import annotations
 
-from typing import Any, Dict
+import asyncio
+import time
+from typing import Any, Dict, Optional, Tuple
 
 from fastapi import APIRouter, Depends, status
 from sqlalchemy import text
 from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.dependencies import (
+    Services,
     get_analysis_service,
-    get_cache_service,
-    get_code_analyzer,
+    get_crew_workflow,
     get_db,
+    get_services,
 )
-from app.config import Settings, get_settings
-from app.crewai_integration.agent import AdvisorCrewIntegration
 from app.models.schemas import (
     CodeAnalysisRequest,
     CodeAnalysisResponse,
     LLMAnalysisResponse,
-    Suggestion,
 )
+from app.interfaces.cache import ICacheService
 from app.services.analysis_service import CodeAnalysisService
-from app.services.cache_service import CacheService
-from app.services.code_analyzer import CodeAnalyzer
 
 
 router = APIRouter()
 
+# Probes de health chegam várias vezes por segundo; o resultado das checagens
+# de banco e cache é reaproveitado por este intervalo
+HEALTH_CHECK_TTL_SECONDS = 1.0
+_health_results: Dict[str, Tuple[float, Any]] = {}
+
+
+def _cached_health_result(name: str) -> Tuple[bool, Any]:
+    entry = _health_results.get(name)
+    if entry is not None and time.monotonic() - entry[0] < HEALTH_CHECK_TTL_SECONDS:
+        return True, entry[1]
+    return False, None
+
+
+async def _database_error(db: AsyncSession) -> Optional[str]:
+    """Run ``SELECT 1`` at most once per TTL; returns the error message, if any."""
+    hit, error = _cached_health_result("database")
+    if hit:
+        return error
+    try:
+        await db.execute(text("SELECT 1"))
+        error = None
+    except SQLAlchemyError as exc:
+        error = str(exc)
+    _health_results["database"] = (time.monotonic(), error)
+    return error
+
+
+async def _cache_available(cache: ICacheService) -> bool:
+    """Check cache availability at most once per TTL."""
+    hit, available = _cached_health_result("cache")
+    if hit:
+        return available
+    # O ping do cliente Redis é bloqueante; não pode travar o event loop
+    available = await asyncio.to_thread(cache.is_available)
+    _health_results["cache"] = (time.monotonic(), available)
+    return available
+
 
 @router.post(
     "/analyze-code", response_model=CodeAnalysisResponse, status_code=status.HTTP_200_OK
 )
-def analyze_code(
+async def analyze_code(
     payload: CodeAnalysisRequest,
     analysis_service: CodeAnalysisService = Depends(get_analysis_service),
 ) -> CodeAnalysisResponse:
     """Analyze code with caching and persistence."""
-    result = analysis_service.analyze_code(
+    result = await analysis_service.analyze_code(
         code=payload.code,
         language_version=payload.language_version,
     )
-    return CodeAnalysisResponse(**result)
+    # Dados produzidos pelo próprio serviço: dispensa nova validação
+    return CodeAnalysisResponse.model_construct(**result)
 
 
 @router.get("/health")
-def healthcheck(
-    db: Session = Depends(get_db),
-    cache: CacheService = Depends(get_cache_service),
-    settings: Settings = Depends(get_settings),
+async def healthcheck(
+    db: AsyncSession = Depends(get_db),
+    services: Services = Depends(get_services),
 ) -> Dict[str, str]:
     status_map: Dict[str, str] = {"status": "ok"}
 
-    try:
-        db.execute(text("SELECT 1"))
+    database_error = await _database_error(db)
+    if database_error is None:
         status_map["database"] = "ok"
-    except SQLAlchemyError as exc:
+    else:
         status_map["database"] = "error"
         status_map["status"] = "degraded"
-        status_map["database_error"] = str(exc)
+        status_map["database_error"] = database_error
 
-    status_map["cache"] = "ok" if cache.is_available() else "fallback"
-    status_map["model_provider"] = settings.model_provider
+    status_map["cache"] = "ok" if await _cache_available(services.cache) else "fallback"
+    status_map["model_provider"] = services.settings.model_provider
 
     return status_map
 
@@ -71,39 +107,29 @@ def healthcheck(
     response_model=LLMAnalysisResponse,
     status_code=status.HTTP_200_OK,
 )
-def analyze_code_with_llm(
+async def analyze_code_with_llm(
     payload: CodeAnalysisRequest,
-    analyzer: CodeAnalyzer = Depends(get_code_analyzer),
-    settings: Settings = Depends(get_settings),
+    workflow: Dict[str, Any] = Depends(get_crew_workflow),
     analysis_service: CodeAnalysisService = Depends(get_analysis_service),
 ) -> LLMAnalysisResponse:
     """
     Analisa código Python usando CrewAI com LLM para gerar relatório priorizado.
     Este endpoint simula a integração do agente com a plataforma CrewAI.
     """
-    import hashlib
-    import time
-
     start = time.perf_counter()
-    code_hash = hashlib.sha256(payload.code.encode("utf-8")).hexdigest()
-
-    # Integração com CrewAI
-    integration = AdvisorCrewIntegration(settings, analyzer)
-    workflow = integration.build_sample_workflow()
 
     # Executa o workflow CrewAI com proteção de erros para evitar 500
     try:
-        result = workflow["crew"].kickoff(inputs={"code_snippet": payload.code})
+        result = await asyncio.to_thread(
+            workflow["crew"].kickoff, inputs={"code_snippet": payload.code}
+        )
         report = str(result) if result else "Nenhuma recomendação adicional."
     except Exception as exc:  # pragma: no cover - robustez em runtime
         report = f"LLM execution failed: {exc}"
 
-    # Obtém as sugestões brutas do analisador e persiste no banco
-    raw_result = analyzer.analyze(payload.code)
-    raw_suggestions = [Suggestion(**item) for item in raw_result.suggestions]
-
-    # Persiste a análise no banco de dados usando o serviço de análise
-    analysis_service.analyze_code(
+    # Executa a análise estática uma única vez: o mesmo resultado alimenta
+    # as sugestões brutas e a persistência no banco
+    analysis = await analysis_service.analyze_code(
         code=payload.code,
         language_version=payload.language_version,
         use_cache=False,  # Não usar cache para análise com LLM
@@ -116,9 +142,9 @@ def analyze_code_with_llm(
     model_info = workflow.get("model", {})
     model_used = model_info.get("provider", "unknown")
 
-    return LLMAnalysisResponse(
-        code_hash=code_hash,
-        raw_suggestions=raw_suggestions,
+    return LLMAnalysisResponse.model_construct(
+        code_hash=analysis["code_hash"],
+        raw_suggestions=analysis["suggestions"],
         prioritized_report=report,
         model_used=model_used,
         analysis_time_ms=elapsed_ms,
@@ -1,10 +1,19 @@
-from functools import lru_cache
-from typing import Any, Dict, Literal, Optional
+from functools import cached_property, lru_cache
+from typing import Any, Dict, Optional
 
 from pydantic import Field, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
+# API key fields tried, in order, when "<provider>_api_key" is not set
+_PROVIDER_API_KEY_ALIASES: Dict[str, tuple[str, ...]] = {
+    "openai": ("openai_api_key",),
+    "gemini": ("google_api_key", "gemini_api_key"),
+    "anthropic": ("anthropic_api_key", "claude_api_key"),
+    "azure_openai": ("azure_openai_api_key",),
+}
+
+
 class Settings(BaseSettings):
     model_config = SettingsConfigDict(
         env_file=".env", env_file_encoding="utf-8", extra="allow"
@@ -16,6 +25,15 @@ class Settings(BaseSettings):
     model_provider: str = Field("openai", alias="MODEL_PROVIDER")
     model_name: Optional[str] = Field(None, alias="MODEL_NAME")
     request_timeout: int = Field(30, alias="REQUEST_TIMEOUT")
+
+    # Database connection pool (ignored for SQLite)
+    db_pool_size: int = Field(20, alias="DB_POOL_SIZE")
+    db_max_overflow: int = Field(40, alias="DB_MAX_OVERFLOW")
+    db_pool_recycle: int = Field(3600, alias="DB_POOL_RECYCLE")
+    db_pool_timeout: int = Field(10, alias="DB_POOL_TIMEOUT")
+
+    # Processos para a análise estática (0 = analisa no próprio processo da API)
+    analysis_workers: int = Field(0, alias="ANALYSIS_WORKERS")
     
     # Optional API keys - users can configure any or all of these
     openai_api_key: Optional[str] = Field(None, alias="OPENAI_API_KEY")
@@ -33,38 +51,43 @@ class Settings(BaseSettings):
     def validate_model_provider(cls, v: str) -> str:
         return v.lower()
 
+    @cached_property
+    def provider_slug(self) -> str:
+        """Provider name normalized for attribute lookups (e.g. 'azure-openai' -> 'azure_openai')."""
+        return self.model_provider.lower().replace("-", "_").replace(".", "_")
+
     def get_api_key(self) -> Optional[str]:
         """
         Get the appropriate API key for the configured provider.
         Supports: google_api_key, openai_api_key, anthropic_api_key, azure_openai_api_key, etc.
         """
-        provider_lower = self.model_provider.lower().replace("-", "_").replace(".", "_")
-        
+        return self._resolved_api_key
+
+    @cached_property
+    def _resolved_api_key(self) -> Optional[str]:
+        provider_lower = self.provider_slug
+
         # Try provider-specific key first (e.g., GOOGLE_API_KEY for gemini)
         provider_key = getattr(self, f"{provider_lower}_api_key", None)
         if provider_key:
             return provider_key
-        
+
         # Try common aliases for this provider
-        provider_aliases = {
-            "openai": ["openai_api_key"],
-            "gemini": ["google_api_key", "gemini_api_key"],
-            "anthropic": ["anthropic_api_key", "claude_api_key"],
-            "azure_openai": ["azure_openai_api_key"],
-        }
-        
-        aliases = provider_aliases.get(provider_lower, [])
-        for alias in aliases:
-            key_value = getattr(self, alias.lower(), None)
+        for alias in _PROVIDER_API_KEY_ALIASES.get(provider_lower, ()):
+            key_value = getattr(self, alias, None)
             if key_value:
                 return key_value
-        
+
         return None
-    
+
     def get_provider_config(self) -> Dict[str, Any]:
         """Get provider-specific configuration with all env vars available."""
-        provider_lower = self.model_provider.lower().replace("-", "_").replace(".", "_")
-        
+        return dict(self._provider_config)
+
+    @cached_property
+    def _provider_config(self) -> Dict[str, Any]:
+        provider_lower = self.provider_slug
+
         config = {
             "model_name": self.model_name,
             "api_key": self.get_api_key(),
@@ -1,12 +1,13 @@
 from __future__ import annotations
 
-import json
-import hashlib
 from typing import Any, Dict
 
+import orjson
+
 from app.config import Settings
 from app.crewai_integration.model_provider import ModelProviderFactory
 from app.services.code_analyzer import CodeAnalyzer
+from app.services.hashing import hash_code
 
 try:
     from crewai import Agent, Crew, Process, Task, LLM as CrewLLM
@@ -47,13 +48,13 @@ def create_analyze_tool(analyzer: CodeAnalyzer) -> Any:
             Um JSON com code_hash, suggestions e analysis_time_ms.
         """
         result = analyzer.analyze(code_snippet)
-        code_hash = hashlib.sha256(code_snippet.encode("utf-8")).hexdigest()
+        code_hash = hash_code(code_snippet)
         payload = {
             "code_hash": code_hash,
             "suggestions": result.suggestions,
             "analysis_time_ms": result.analysis_time_ms,
         }
-        return json.dumps(payload, ensure_ascii=False)
+        return orjson.dumps(payload).decode("utf-8")
 
     return analyze_python_code
 
@@ -63,6 +64,8 @@ class AdvisorCrewIntegration:
         self.settings = settings
         self.analyzer = analyzer
         self.model_provider = ModelProviderFactory.from_settings(settings)
+        # Cliente LLM só guarda configuração: compartilhado entre workflows
+        self._llm: Any = None
 
     def build_agent(self) -> Agent:
         if Agent is None:
@@ -70,10 +73,11 @@ class AdvisorCrewIntegration:
                 "Biblioteca CrewAI não está disponível. Instale crewai para utilizar esta integração."
             )
 
-        llm_config = self.model_provider.get_llm_config()
-        # Constrói a instância do LLM diretamente para evitar passar dict como "model"
-        # Ex.: {"model": "gemini/gemini-2.0-flash", ...}
-        llm_instance = CrewLLM(**llm_config)
+        if self._llm is None:
+            llm_config = self.model_provider.get_llm_config()
+            # Constrói a instância do LLM diretamente para evitar passar dict como "model"
+            # Ex.: {"model": "gemini/gemini-2.0-flash", ...}
+            self._llm = CrewLLM(**llm_config)
 
         # Create tool with injected analyzer
         analyze_tool = create_analyze_tool(self.analyzer)
@@ -89,7 +93,7 @@ class AdvisorCrewIntegration:
                 "em design patterns, performance e mantenabilidade."
             ),
             allow_delegation=False,
-            llm=llm_instance,
+            llm=self._llm,
             tools=[analyze_tool],
         )
 
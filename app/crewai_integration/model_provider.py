@@ -2,13 +2,16 @@ from __future__ import annotations
 
 import os
 from abc import ABC, abstractmethod
-from typing import Any, Dict, Optional
+from functools import lru_cache
+from typing import Any, Dict, Optional, Tuple
 
 from app.config import Settings
 
 
 class BaseModelProvider(ABC):
     provider_name: str
+    # Variável lida pelo LiteLLM para autenticação; exportada uma única vez
+    api_key_env_var: Optional[str] = None
 
     def __init__(
         self, *, model_name: Optional[str], api_key: Optional[str], **extra: Any
@@ -17,6 +20,9 @@ class BaseModelProvider(ABC):
         self.api_key = api_key
         self.extra = extra
         self.validate()
+        env_key = self.env_api_key()
+        if self.api_key_env_var and env_key:
+            os.environ.setdefault(self.api_key_env_var, env_key)
 
     def validate(self) -> None:
         if not self.api_key:
@@ -24,6 +30,10 @@ class BaseModelProvider(ABC):
                 f"Chave de API não configurada para o provedor {self.provider_name}. Defina CREWAI_API_KEY ou variável específica."
             )
 
+    def env_api_key(self) -> Optional[str]:
+        """Chave exportada em ``api_key_env_var`` na construção do provedor."""
+        return self.api_key
+
     @abstractmethod
     def get_llm_config(self) -> Dict[str, Any]:
         """Retorna a configuração utilizada pelo CrewAI para instanciar o LLM."""
@@ -37,14 +47,13 @@ class BaseModelProvider(ABC):
 
 class OpenAIModelProvider(BaseModelProvider):
     provider_name = "openai"
+    api_key_env_var = "OPENAI_API_KEY"
 
     def get_llm_config(self) -> Dict[str, Any]:
         # CrewAI/LiteLLM espera um dict plano com 'model' e usa OPENAI_API_KEY
         # Formato recomendado: model="openai/<model>"
         base_model = self.model_name or "gpt-4o-mini"
         full_model = f"openai/{base_model}"
-        if self.api_key:
-            os.environ["OPENAI_API_KEY"] = self.api_key  # garante disponibilidade no ambiente
         return {
             "model": full_model,
             "api_key": self.api_key,
@@ -54,14 +63,17 @@ class OpenAIModelProvider(BaseModelProvider):
 
 class GeminiModelProvider(BaseModelProvider):
     provider_name = "gemini"
+    # CrewAI (via LiteLLM) usa GOOGLE_API_KEY do ambiente para autenticação do Gemini
+    api_key_env_var = "GOOGLE_API_KEY"
+
+    def env_api_key(self) -> Optional[str]:
+        return self.extra.get("google_api_key") or self.api_key
 
     def get_llm_config(self) -> Dict[str, Any]:
         model = self.model_name or "gemini-2.0-flash"
 
         # CrewAI (via LiteLLM) espera apenas um dict simples com 'model'
-        # e usa GOOGLE_API_KEY do ambiente para autenticação do Gemini.
-        google_api_key = self.extra.get("google_api_key", self.api_key)
-        os.environ["GOOGLE_API_KEY"] = google_api_key
+        google_api_key = self.env_api_key()
 
         # Retorne somente o que o Agent aceita como llm config: {'model': 'gemini/<model>'}
         # Sem o wrapper provider/config.
@@ -109,6 +121,17 @@ class AzureOpenAIModelProvider(BaseModelProvider):
         }
 
 
+@lru_cache(maxsize=16)
+def _create_provider(
+    provider_cls: type[BaseModelProvider],
+    model_name: Optional[str],
+    api_key: str,
+    extra_items: Tuple[Tuple[str, Any], ...],
+) -> BaseModelProvider:
+    """Build a provider once per (class, model, key, extra config) combination."""
+    return provider_cls(model_name=model_name, api_key=api_key, **dict(extra_items))
+
+
 class ModelProviderFactory:
     """Factory for creating model providers with dynamic registration support."""
 
@@ -153,10 +176,12 @@ class ModelProviderFactory:
         provider_config = settings.get_provider_config()
         
         # Remove api_key and model_name as they're passed separately
-        extra = {k: v for k, v in provider_config.items() if k not in ("api_key", "model_name")}
-
-        return provider_cls(
-            model_name=settings.model_name, 
-            api_key=api_key, 
-            **extra
+        extra = tuple(
+            sorted(
+                (k, v)
+                for k, v in provider_config.items()
+                if k not in ("api_key", "model_name")
+            )
         )
+
+        return _create_provider(provider_cls, settings.model_name, api_key, extra)
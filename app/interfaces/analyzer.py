@@ -1,31 +1,86 @@
 """Interfaces for code analysis services."""
 
-from dataclasses import dataclass
-from typing import Any, Dict, List
-from typing_extensions import Protocol
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Mapping, Optional, Set
+from typing_extensions import Protocol, TypedDict
+
+
+class RawSuggestion(TypedDict):
+    """Suggestion as emitted by the rules; a plain dict at runtime."""
+
+    rule_id: str
+    message: str
+    severity: str
+    line: Optional[int]
+    column: Optional[int]
+    metadata: Dict[str, Any]
 
 
 @dataclass
 class AnalysisResult:
     """Result of code analysis."""
 
-    suggestions: List[Dict[str, Any]]
+    suggestions: List[RawSuggestion]
     analysis_time_ms: int
 
 
+@dataclass
+class AnalysisContext:
+    """Per-analysis state shared by every rule during a single tree traversal."""
+
+    suggestions: List[RawSuggestion]
+    used_names: Set[str] = field(default_factory=set)
+    """Every name read (``ast.Name`` in ``Load`` context), collected once for all rules."""
+    rule_state: Dict[Any, Any] = field(default_factory=dict)
+    """
+    Scratch space for rules that aggregate data across nodes, keyed by the rule
+    instance itself so two instances sharing a rule_id never clobber each other.
+    """
+
+
+NodeHandler = Callable[[Any, AnalysisContext], None]
+"""Callback invoked with an AST node and the current analysis context."""
+
+
 class IAnalysisRule(Protocol):
     """Protocol defining a single analysis rule."""
 
     rule_id: str
     """Unique identifier for this rule."""
 
-    def analyze(self, tree: Any, suggestions: List[Dict[str, Any]]) -> None:
+    @property
+    def handlers(self) -> Mapping[type, NodeHandler]:
+        """
+        Callbacks keyed by the AST node type they handle.
+
+        The analyzer walks the tree once and dispatches every node to the
+        handlers registered for its exact type.
+        """
+        ...
+
+    @property
+    def leave_handlers(self) -> Mapping[type, NodeHandler]:
         """
-        Analyze code and add suggestions.
+        Callbacks keyed by node type, invoked after the node's whole subtree
+        has been visited.
+        """
+        ...
+
+    def begin(self, context: AnalysisContext) -> None:
+        """
+        Prepare per-analysis state before the traversal starts.
 
         Args:
-            tree: Parsed AST tree of the code
-            suggestions: List to append suggestions to
+            context: Context shared by all rules for this analysis
+        """
+        ...
+
+    def finalize(self, context: AnalysisContext) -> None:
+        """
+        Emit suggestions that depend on the whole tree after the traversal.
+
+        Args:
+            context: Context shared by all rules for this analysis
         """
         ...
 
@@ -33,15 +88,15 @@ class IAnalysisRule(Protocol):
 class ICodeAnalyzer(Protocol):
     """Protocol defining the contract for code analyzers."""
 
-    def analyze(self, code: str) -> AnalysisResult:
+    def analyze(self, code: str, code_hash: Optional[str] = None) -> AnalysisResult:
         """
         Analyze code and return results.
 
         Args:
             code: The source code to analyze
+            code_hash: ``hash_code(code)``, if the caller already computed it
 
         Returns:
             AnalysisResult with suggestions and timing information
         """
         ...
-
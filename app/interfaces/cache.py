@@ -1,6 +1,6 @@
 """Interface for cache services."""
 
-from typing import Any, Optional
+from typing import Any, List, Optional, Sequence
 from typing_extensions import Protocol
 
 
@@ -19,6 +19,18 @@ class ICacheService(Protocol):
         """
         ...
 
+    def get_many(self, keys: Sequence[str]) -> List[Optional[Any]]:
+        """
+        Retrieve several values from cache in one round-trip.
+
+        Args:
+            keys: The cache keys to retrieve
+
+        Returns:
+            Cached values in the same order as ``keys`` (None for misses)
+        """
+        ...
+
     def set(self, key: str, value: Any, ttl_seconds: Optional[int] = None) -> None:
         """
         Store a value in cache.
@@ -1,13 +1,13 @@
 """Interface for database services."""
 
-from typing import Any, Optional
+from typing import Any, Mapping, Optional, Sequence
 from typing_extensions import Protocol
 
 
 class IDatabaseService(Protocol):
     """Protocol defining the contract for database services."""
 
-    def get_by_code_hash(self, code_hash: str) -> Optional[Any]:
+    async def get_by_code_hash(self, code_hash: str) -> Optional[Any]:
         """
         Retrieve an analysis history record by code hash.
 
@@ -19,12 +19,12 @@ class IDatabaseService(Protocol):
         """
         ...
 
-    def create(
+    async def create(
         self,
         *,
         code_hash: str,
         code_snippet: Optional[str],
-        suggestions: list[dict[str, Any]],
+        suggestions: Sequence[Mapping[str, Any]],
         analysis_time_ms: Optional[int],
         language_version: Optional[str],
     ) -> Any:
@@ -43,3 +43,11 @@ class IDatabaseService(Protocol):
         """
         ...
 
+    async def bulk_create(self, rows: Sequence[Mapping[str, Any]]) -> None:
+        """
+        Create many analysis history records at once.
+
+        Args:
+            rows: Column values for each record (same keys as ``create``)
+        """
+        ...
@@ -4,17 +4,26 @@ from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 
+from app.api.dependencies import build_services
 from app.api.routes import router
 from app.config import get_settings
-from app.models.database import Base, engine
+from app.models.database import create_tables
 
 
 @asynccontextmanager
-async def lifespan(_app: FastAPI):
+async def lifespan(application: FastAPI):
     # Cria as tabelas do banco de dados na inicialização
-    Base.metadata.create_all(bind=engine)
-    yield
+    await create_tables()
+    # Singletons (analisador, cache, pool de processos) compartilhados por todas as requisições
+    services = build_services(get_settings())
+    application.state.services = services
+    try:
+        yield
+    finally:
+        if services.executor is not None:
+            services.executor.shutdown(cancel_futures=True)
 
 
 def create_app() -> FastAPI:
@@ -24,6 +33,7 @@ def create_app() -> FastAPI:
         title="Advisor Code Analyzer",
         version="1.0.0",
         lifespan=lifespan,
+        default_response_class=ORJSONResponse,
     )
 
     application.add_middleware(
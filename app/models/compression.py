@@ -0,0 +1,78 @@
+"""Storage format of ``AnalysisHistory.code_snippet``."""
+
+from __future__ import annotations
+
+from typing import Any, Dict, Optional
+
+import zstandard
+
+# Snippets up to this size (UTF-8 bytes) stay as plain text; larger ones are
+# stored zstd-compressed, which shrinks Python source several times
+SNIPPET_COMPRESSION_THRESHOLD = 4 * 1024
+SNIPPET_ZSTD_LEVEL = 3
+ZSTD_CODEC = "zstd"
+# Snippets são codificados e comprimidos em blocos deste tamanho (caracteres)
+_CHUNK_CHARS = 64 * 1024
+
+
+def encode_snippet(code_snippet: Optional[str]) -> Dict[str, Any]:
+    """
+    Build the snippet columns of an ``AnalysisHistory`` row.
+
+    Args:
+        code_snippet: The original code snippet, if it should be stored
+
+    Returns:
+        Values for ``code_snippet``, ``code_snippet_zstd`` and
+        ``code_snippet_compression``
+    """
+    # Cada caractere ocupa de 1 a 4 bytes em UTF-8: acima do limite em
+    # caracteres já passa em bytes; abaixo, só codifica se puder passar
+    if code_snippet is not None and (
+        len(code_snippet) > SNIPPET_COMPRESSION_THRESHOLD
+        or (
+            len(code_snippet) * 4 > SNIPPET_COMPRESSION_THRESHOLD
+            and len(code_snippet.encode("utf-8")) > SNIPPET_COMPRESSION_THRESHOLD
+        )
+    ):
+        return {
+            "code_snippet": None,
+            "code_snippet_zstd": _compress(code_snippet),
+            "code_snippet_compression": ZSTD_CODEC,
+        }
+    return {
+        "code_snippet": code_snippet,
+        "code_snippet_zstd": None,
+        "code_snippet_compression": None,
+    }
+
+
+def _compress(code_snippet: str) -> bytes:
+    """Compress a snippet block by block, without a full UTF-8 copy of it."""
+    compressor = zstandard.ZstdCompressor(level=SNIPPET_ZSTD_LEVEL).compressobj()
+    parts = [
+        compressor.compress(code_snippet[start : start + _CHUNK_CHARS].encode("utf-8"))
+        for start in range(0, len(code_snippet), _CHUNK_CHARS)
+    ]
+    parts.append(compressor.flush())
+    return b"".join(parts)
+
+
+def decode_snippet(
+    code_snippet: Optional[str],
+    compressed: Optional[bytes],
+    compression: Optional[str],
+) -> Optional[str]:
+    """
+    Recover the original snippet from the stored columns.
+
+    Raises:
+        ValueError: If the row uses an unknown compression codec
+    """
+    if compressed is None:
+        return code_snippet
+    if compression != ZSTD_CODEC:
+        raise ValueError(f"Compressão de snippet desconhecida: {compression!r}")
+    # Frames gravados em streaming não trazem o tamanho original no cabeçalho
+    decompressor = zstandard.ZstdDecompressor().decompressobj()
+    return decompressor.decompress(compressed).decode("utf-8")
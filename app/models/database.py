@@ -2,20 +2,35 @@ from __future__ import annotations
 
 import uuid
 from datetime import datetime
-from typing import Any
-
-from sqlalchemy import DateTime, Index, Integer, Text, create_engine, text
+from typing import Any, AsyncGenerator
+
+import orjson
+from sqlalchemy import (
+    JSON,
+    DateTime,
+    Engine,
+    Index,
+    Integer,
+    LargeBinary,
+    Connection,
+    Text,
+    create_engine,
+    inspect,
+    text,
+)
 from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import (
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.ext.compiler import compiles
-from sqlalchemy.orm import DeclarativeBase, Mapped, Session, mapped_column, sessionmaker
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+from sqlalchemy.pool import StaticPool
 
 from app.config import get_settings
-
-
-# Override JSONB for SQLite
-@compiles(JSONB, "sqlite")
-def _compile_jsonb_sqlite(_type, compiler, **kw):  # noqa: D401, ANN001
-    return "JSON"
+from app.models.compression import decode_snippet
 
 
 # Override UUID default for SQLite
@@ -36,16 +51,89 @@ engine: Any = None
 SessionLocal: Any = None
 
 
+# Sync drivers accepted in DATABASE_URL mapped to their asyncio counterparts
+_ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+    "sqlite+pysqlite": "sqlite+aiosqlite",
+}
+
+
+# Asyncio drivers mapped back to blocking drivers for scripts and migrations
+_SYNC_DRIVERS = {
+    "postgresql+asyncpg": "postgresql+psycopg2",
+    "sqlite+aiosqlite": "sqlite+pysqlite",
+}
+
+
+def _to_async_url(database_url: str) -> str:
+    """Rewrite a sync SQLAlchemy URL to use the matching asyncio driver."""
+    url = make_url(database_url)
+    drivername = _ASYNC_DRIVERS.get(url.drivername, url.drivername)
+    return url.set(drivername=drivername).render_as_string(hide_password=False)
+
+
+def _to_sync_url(database_url: str) -> str:
+    """Rewrite an asyncio SQLAlchemy URL to use the matching blocking driver."""
+    url = make_url(database_url)
+    drivername = _SYNC_DRIVERS.get(url.drivername, url.drivername)
+    return url.set(drivername=drivername).render_as_string(hide_password=False)
+
+
+def _json_serializer(value: Any) -> str:
+    """Encode JSON columns with orjson instead of the stdlib json module."""
+    # Mesmas opções do cache Redis: o que é cacheado também pode ser gravado
+    return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+
+
 def _create_engine_from_settings() -> Any:
     """Create database engine from settings. Internal function."""
     settings = get_settings()
-    return create_engine(settings.database_url, pool_pre_ping=True, future=True)
+    url = _to_async_url(settings.database_url)
+    pool_options: dict[str, Any]
+    if url.startswith("sqlite"):
+        # SQLite não usa pool de rede; um banco em memória só existe dentro
+        # de uma conexão, então ela é compartilhada por todas as sessões
+        pool_options = {"connect_args": {"check_same_thread": False}}
+        if make_url(url).database in (None, "", ":memory:"):
+            pool_options["poolclass"] = StaticPool
+    else:
+        pool_options = {
+            "pool_size": settings.db_pool_size,
+            "max_overflow": settings.db_max_overflow,
+            "pool_recycle": settings.db_pool_recycle,
+            "pool_timeout": settings.db_pool_timeout,
+        }
+    return create_async_engine(
+        url,
+        pool_pre_ping=True,
+        json_serializer=_json_serializer,
+        json_deserializer=orjson.loads,
+        **pool_options,
+    )
+
+
+def create_sync_engine() -> Engine:
+    """
+    Create a blocking engine for the configured database.
+
+    The request path only uses the async ``engine``; this one is meant for
+    command-line scripts and schema migrations, which run outside an event loop.
+    """
+    settings = get_settings()
+    return create_engine(
+        _to_sync_url(settings.database_url),
+        pool_pre_ping=True,
+        json_serializer=_json_serializer,
+        json_deserializer=orjson.loads,
+    )
 
 
 def _create_sessionmaker(eng: Any) -> Any:
     """Create session maker from engine. Internal function."""
-    return sessionmaker(
-        bind=eng, autoflush=False, autocommit=False, expire_on_commit=False
+    return async_sessionmaker(
+        bind=eng, class_=AsyncSession, autoflush=False, expire_on_commit=False
     )
 
 
@@ -63,7 +151,12 @@ class AnalysisHistory(Base):
     __tablename__ = "analysis_history"
     __table_args__ = (
         Index("ix_analysis_history_created_at", "created_at"),
-        Index("ix_analysis_history_code_hash", "code_hash"),
+        # Serve "última análise por code_hash" sem ordenação extra
+        Index(
+            "ix_analysis_history_code_hash_created_at",
+            "code_hash",
+            text("created_at DESC"),
+        ),
         Index("ix_analysis_history_suggestions", "suggestions", postgresql_using="gin"),
     )
 
@@ -74,7 +167,12 @@ class AnalysisHistory(Base):
     )
     code_hash: Mapped[str] = mapped_column(Text, nullable=False)
     code_snippet: Mapped[str | None] = mapped_column(Text, nullable=True)
-    suggestions: Mapped[dict] = mapped_column(JSONB, nullable=False)
+    # Snippets grandes ficam comprimidos aqui, com code_snippet = NULL
+    code_snippet_zstd: Mapped[bytes | None] = mapped_column(LargeBinary, nullable=True)
+    code_snippet_compression: Mapped[str | None] = mapped_column(Text, nullable=True)
+    suggestions: Mapped[dict] = mapped_column(
+        JSONB().with_variant(JSON(), "sqlite"), nullable=False
+    )
     analysis_time_ms: Mapped[int | None] = mapped_column(Integer, nullable=True)
     language_version: Mapped[str | None] = mapped_column(Text, nullable=True)
     created_at: Mapped[datetime] = mapped_column(
@@ -82,10 +180,55 @@ class AnalysisHistory(Base):
         server_default=text("CURRENT_TIMESTAMP"),
     )
 
+    @property
+    def source_code(self) -> str | None:
+        """Original snippet, decompressed if it was stored compressed."""
+        return decode_snippet(
+            self.code_snippet, self.code_snippet_zstd, self.code_snippet_compression
+        )
 
-def get_db_session() -> Session:
-    db = SessionLocal()
-    try:
+
+async def get_db_session() -> AsyncGenerator[AsyncSession, None]:
+    async with SessionLocal() as db:
         yield db
-    finally:
-        db.close()
+
+
+# Colunas adicionadas depois da criação original da tabela
+_ADDED_COLUMNS = ("code_snippet_zstd", "code_snippet_compression")
+# Índices substituídos por versões compostas
+_DROPPED_INDEXES = ("ix_analysis_history_code_hash",)
+
+
+def upgrade_schema(conn: Connection) -> None:
+    """
+    Bring an existing ``analysis_history`` table up to the current model.
+
+    ``create_all`` skips tables that already exist, so columns and indexes added
+    after a database was created have to be applied here. Safe to run repeatedly.
+    """
+    table = Base.metadata.tables[AnalysisHistory.__tablename__]
+    inspector = inspect(conn)
+    existing_columns = {column["name"] for column in inspector.get_columns(table.name)}
+    for name in _ADDED_COLUMNS:
+        if name not in existing_columns:
+            column_type = table.c[name].type.compile(dialect=conn.dialect)
+            conn.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {name} {column_type}"))
+
+    existing_indexes = {index["name"] for index in inspector.get_indexes(table.name)}
+    for name in _DROPPED_INDEXES:
+        if name in existing_indexes:
+            conn.execute(text(f"DROP INDEX {name}"))
+    for index in table.indexes:
+        if index.name not in existing_indexes:
+            index.create(conn)
+
+
+def _create_and_upgrade(conn: Connection) -> None:
+    Base.metadata.create_all(conn)
+    upgrade_schema(conn)
+
+
+async def create_tables(eng: Any = None) -> None:
+    """Create missing tables and upgrade existing ones on the given (or module-level) async engine."""
+    async with (eng or engine).begin() as conn:
+        await conn.run_sync(_create_and_upgrade)
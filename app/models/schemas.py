@@ -1,7 +1,7 @@
 from datetime import datetime
 from typing import Any, Literal, Optional
 
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import AliasChoices, BaseModel, ConfigDict, Field
 
 
 class Suggestion(BaseModel):
@@ -45,7 +45,10 @@ class AnalysisHistoryRead(BaseModel):
     
     id: str
     code_hash: str
-    code_snippet: Optional[str]
+    # Lido de AnalysisHistory.source_code, que descomprime snippets grandes
+    code_snippet: Optional[str] = Field(
+        validation_alias=AliasChoices("source_code", "code_snippet")
+    )
     suggestions: list[Suggestion]
     analysis_time_ms: Optional[int]
     language_version: Optional[str]
@@ -0,0 +1,55 @@
+"""Process pool that runs the CPU-bound parse + rule traversal off the event loop."""
+
+from __future__ import annotations
+
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+from app.interfaces.analyzer import AnalysisResult
+from app.services.code_analyzer import CodeAnalyzer
+
+# Analisador de cada processo worker, criado uma vez pelo initializer
+_worker_analyzer: Optional[CodeAnalyzer] = None
+
+
+def _init_worker() -> None:
+    global _worker_analyzer
+    _worker_analyzer = CodeAnalyzer()
+
+
+def analyze_in_worker(code: str, code_hash: Optional[str] = None) -> AnalysisResult:
+    """
+    Analyze code with the worker's default analyzer.
+
+    Module-level so it can be pickled by ``ProcessPoolExecutor``.
+
+    Args:
+        code: The source code to analyze
+        code_hash: ``hash_code(code)``, if the caller already computed it
+
+    Returns:
+        AnalysisResult with suggestions and timing information
+    """
+    analyzer = _worker_analyzer
+    if analyzer is None:
+        _init_worker()
+        analyzer = _worker_analyzer
+    return analyzer.analyze(code, code_hash)  # type: ignore[union-attr]
+
+
+def create_analysis_executor(max_workers: int) -> ProcessPoolExecutor:
+    """
+    Create the pool used by ``CodeAnalysisService`` for fresh analyses.
+
+    Workers are spawned rather than forked: the parent already runs an event
+    loop and database/Redis connections that must not be duplicated.
+
+    Args:
+        max_workers: Number of worker processes
+    """
+    return ProcessPoolExecutor(
+        max_workers=max_workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker,
+    )
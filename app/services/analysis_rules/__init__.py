@@ -5,16 +5,21 @@ from app.services.analysis_rules.docstrings import DocstringRule
 from app.services.analysis_rules.functions import FunctionMetricsRule
 from app.services.analysis_rules.imports import ImportAnalysisRule
 from app.services.analysis_rules.naming import NamingConventionRule
+from app.services.analysis_rules.runner import RuleRunner
 from app.services.analysis_rules.statements import PrintStatementRule
 from app.services.analysis_rules.variables import UnusedVariableRule
+from app.services.analysis_rules.visitor import CompositeVisitor, build_dispatch_table
 
 __all__ = [
     "BaseAnalysisRule",
+    "CompositeVisitor",
     "DocstringRule",
     "FunctionMetricsRule",
     "ImportAnalysisRule",
     "NamingConventionRule",
     "PrintStatementRule",
+    "RuleRunner",
     "UnusedVariableRule",
+    "build_dispatch_table",
 ]
 
@@ -2,36 +2,109 @@
 
 from __future__ import annotations
 
-from abc import ABC, abstractmethod
-from typing import Any, Dict, List
+from functools import cached_property
+from typing import Any, Dict, List, Optional, Tuple, Type
 
 import ast
 
+from app.interfaces.analyzer import AnalysisContext, NodeHandler, RawSuggestion
+from app.services.analysis_rules.runner import RuleRunner
 
-class BaseAnalysisRule(ABC):
-    """Abstract base class for code analysis rules."""
+
+def make_suggestion(
+    rule_id: str,
+    message: str,
+    severity: str,
+    line: Optional[int],
+    column: Optional[int] = None,
+    metadata: Optional[Dict[str, Any]] = None,
+) -> RawSuggestion:
+    """
+    Build a suggestion with the fixed key set every rule emits.
+
+    Args:
+        rule_id: Identifier reported to clients (may differ from the rule's own)
+        message: Human-readable description of the issue
+        severity: One of ``info``, ``warning`` or ``error``
+        line: Line of the offending node, if known
+        column: Column of the offending node, if known
+        metadata: Extra rule-specific data; empty by default
+
+    Returns:
+        Suggestion dictionary ready to append to ``context.suggestions``
+    """
+    return {
+        "rule_id": rule_id,
+        "message": message,
+        "severity": severity,
+        "line": line,
+        "column": column,
+        "metadata": {} if metadata is None else metadata,
+    }
+
+
+class BaseAnalysisRule:
+    """Base class for code analysis rules driven by a shared tree traversal."""
 
     rule_id: str
     """Unique identifier for this rule."""
 
-    def analyze(self, tree: ast.AST, suggestions: List[Dict[str, Any]]) -> None:
+    node_types: Tuple[Type[ast.AST], ...] = ()
+    """AST node types passed to ``visit`` during the traversal."""
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        """
+        Reject rules that would silently never run.
+
+        Raises:
+            TypeError: If the subclass still implements the removed ``_analyze``
+                hook, or registers no node types and no custom ``handlers``
         """
-        Analyze code and add suggestions.
+        super().__init_subclass__(**kwargs)
+        if hasattr(cls, "_analyze"):
+            raise TypeError(
+                f"{cls.__name__} define _analyze(), que não é mais chamado: "
+                "declare node_types e implemente visit()."
+            )
+        if cls.handlers is BaseAnalysisRule.handlers and not cls.node_types:
+            raise TypeError(f"{cls.__name__} precisa declarar node_types.")
+
+    @property
+    def handlers(self) -> Dict[type, NodeHandler]:
+        """Callbacks keyed by node type; defaults to ``visit`` for each of ``node_types``."""
+        return {node_type: self.visit for node_type in self.node_types}
+
+    @property
+    def leave_handlers(self) -> Dict[type, NodeHandler]:
+        """Callbacks run after a node's subtree has been visited; none by default."""
+        return {}
+
+    def begin(self, context: AnalysisContext) -> None:
+        """Prepare per-analysis state before the traversal starts."""
+
+    def visit(self, node: Any, context: AnalysisContext) -> None:
+        """
+        Inspect a single node of one of the registered ``node_types``.
 
         Args:
-            tree: Parsed AST tree of the code
-            suggestions: List to append suggestions to
+            node: AST node being visited
+            context: Context shared by all rules for this analysis
         """
-        self._analyze(tree, suggestions)
 
-    @abstractmethod
-    def _analyze(self, tree: ast.AST, suggestions: List[Dict[str, Any]]) -> None:
+    def finalize(self, context: AnalysisContext) -> None:
+        """Emit suggestions that depend on the whole tree after the traversal."""
+
+    def analyze(self, tree: ast.AST, suggestions: List[RawSuggestion]) -> None:
         """
-        Internal analysis method implemented by subclasses.
+        Run only this rule over a parsed tree and add suggestions.
 
         Args:
             tree: Parsed AST tree of the code
             suggestions: List to append suggestions to
         """
-        ...
+        suggestions.extend(self._own_runner.run_tree(tree))
 
+    @cached_property
+    def _own_runner(self) -> RuleRunner:
+        # Despacho só desta regra, montado uma vez por instância
+        return RuleRunner([self])
@@ -2,33 +2,39 @@
 
 from __future__ import annotations
 
-from typing import Any, Dict, List
+from typing import Any
 
 import ast
 
-from app.services.analysis_rules.base import BaseAnalysisRule
+from app.interfaces.analyzer import AnalysisContext
+from app.services.analysis_rules.base import BaseAnalysisRule, make_suggestion
+
+
+_MISSING_DOCSTRING_MESSAGE = "Função '{name}' deveria conter docstring."
 
 
 class DocstringRule(BaseAnalysisRule):
     """Checks for missing docstrings."""
 
     rule_id = "missing_docstring"
-
-    def _analyze(self, tree: ast.AST, suggestions: List[Dict[str, Any]]) -> None:
-        for node in ast.walk(tree):
-            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
-                if node.name.startswith("_"):
-                    continue
-                docstring = ast.get_docstring(node)
-                if not docstring:
-                    suggestions.append(
-                        {
-                            "rule_id": self.rule_id,
-                            "message": f"Função '{node.name}' deveria conter docstring.",
-                            "severity": "info",
-                            "line": node.lineno,
-                            "column": None,
-                            "metadata": {},
-                        }
-                    )
-
+    node_types = (ast.FunctionDef, ast.AsyncFunctionDef)
+
+    def visit(self, node: Any, context: AnalysisContext) -> None:
+        if node.name.startswith("_"):
+            return
+        # Mesmo critério de ast.get_docstring sem o inspect.cleandoc: só
+        # importa se há uma string não vazia como primeira instrução
+        # (isspace em vez de strip: nenhuma cópia da docstring é alocada)
+        body = node.body
+        first = body[0] if body else None
+        value = first.value if type(first) is ast.Expr else None
+        docstring = value.value if type(value) is ast.Constant else None
+        if not (type(docstring) is str and docstring and not docstring.isspace()):
+            context.suggestions.append(
+                make_suggestion(
+                    self.rule_id,
+                    _MISSING_DOCSTRING_MESSAGE.format(name=node.name),
+                    "info",
+                    node.lineno,
+                )
+            )
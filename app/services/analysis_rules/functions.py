@@ -6,63 +6,93 @@ from typing import Any, Dict, List
 
 import ast
 
-from app.services.analysis_rules.base import BaseAnalysisRule
+from app.interfaces.analyzer import AnalysisContext, NodeHandler
+from app.services.analysis_rules.base import BaseAnalysisRule, make_suggestion
+
+# Nós que abrem um novo caminho de execução; tipos concretos do ast, usados
+# como chaves da tabela de despacho (lookup exato por type(node))
+_COMPLEXITY_TYPES = frozenset(
+    {
+        ast.If,
+        ast.For,
+        ast.AsyncFor,
+        ast.While,
+        ast.With,
+        ast.AsyncWith,
+        ast.Try,
+        ast.BoolOp,
+        ast.comprehension,
+        ast.ExceptHandler,
+    }
+)
+
+
+_LONG_FUNCTION_MESSAGE = (
+    "Função '{name}' possui {length} linhas (máximo recomendado: 50)."
+)
+_HIGH_COMPLEXITY_MESSAGE = (
+    "Função '{name}' possui complexidade ciclomática {complexity} (máximo recomendado: 10)."
+)
 
 
 class FunctionMetricsRule(BaseAnalysisRule):
     """Checks function length and cyclomatic complexity."""
 
     rule_id = "function_metrics"
+    node_types = (ast.FunctionDef,)
+
+    @property
+    def handlers(self) -> Dict[type, NodeHandler]:
+        handlers: Dict[type, NodeHandler] = dict.fromkeys(
+            _COMPLEXITY_TYPES, self._count_branch
+        )
+        handlers[ast.FunctionDef] = self.visit
+        return handlers
+
+    @property
+    def leave_handlers(self) -> Dict[type, NodeHandler]:
+        return {ast.FunctionDef: self._leave_function}
+
+    def begin(self, context: AnalysisContext) -> None:
+        # Pilha de contadores de desvios, um por função aberta na travessia
+        branch_counts: List[int] = []
+        context.rule_state[self] = branch_counts
+
+    def visit(self, node: Any, context: AnalysisContext) -> None:
+        lineno = node.lineno
+        function_length = (node.end_lineno or lineno) - lineno + 1
+        if function_length > 50:
+            context.suggestions.append(
+                make_suggestion(
+                    "long_function",
+                    _LONG_FUNCTION_MESSAGE.format(name=node.name, length=function_length),
+                    "warning",
+                    lineno,
+                    metadata={"length": function_length},
+                )
+            )
+        context.rule_state[self].append(0)
+
+    def _count_branch(self, node: Any, context: AnalysisContext) -> None:
+        branch_counts = context.rule_state[self]
+        if branch_counts:
+            branch_counts[-1] += 1
 
-    def _analyze(self, tree: ast.AST, suggestions: List[Dict[str, Any]]) -> None:
-        for node in ast.walk(tree):
-            if isinstance(node, ast.FunctionDef):
-                end_lineno = getattr(node, "end_lineno", node.lineno)
-                function_length = end_lineno - node.lineno + 1
-                if function_length > 50:
-                    suggestions.append(
-                        {
-                            "rule_id": "long_function",
-                            "message": f"Função '{node.name}' possui {function_length} linhas (máximo recomendado: 50).",
-                            "severity": "warning",
-                            "line": node.lineno,
-                            "column": None,
-                            "metadata": {"length": function_length},
-                        }
-                    )
-
-                complexity = self._calculate_cyclomatic_complexity(node)
-                if complexity > 10:
-                    suggestions.append(
-                        {
-                            "rule_id": "high_cyclomatic_complexity",
-                            "message": f"Função '{node.name}' possui complexidade ciclomática {complexity} (máximo recomendado: 10).",
-                            "severity": "warning",
-                            "line": node.lineno,
-                            "column": None,
-                            "metadata": {"complexity": complexity},
-                        }
-                    )
-
-    def _calculate_cyclomatic_complexity(self, node: ast.AST) -> int:
-        complexity = 1
-        for child in ast.walk(node):
-            if isinstance(
-                child,
-                (
-                    ast.If,
-                    ast.For,
-                    ast.AsyncFor,
-                    ast.While,
-                    ast.With,
-                    ast.AsyncWith,
-                    ast.Try,
-                    ast.BoolOp,
-                    ast.comprehension,
-                ),
-            ):
-                complexity += 1
-            elif isinstance(child, ast.ExceptHandler):
-                complexity += 1
-        return complexity
+    def _leave_function(self, node: Any, context: AnalysisContext) -> None:
+        branch_counts = context.rule_state[self]
+        branches = branch_counts.pop()
+        # Desvios de funções aninhadas também contam para a função externa
+        if branch_counts:
+            branch_counts[-1] += branches
 
+        complexity = branches + 1
+        if complexity > 10:
+            context.suggestions.append(
+                make_suggestion(
+                    "high_cyclomatic_complexity",
+                    _HIGH_COMPLEXITY_MESSAGE.format(name=node.name, complexity=complexity),
+                    "warning",
+                    node.lineno,
+                    metadata={"complexity": complexity},
+                )
+            )
@@ -2,49 +2,52 @@
 
 from __future__ import annotations
 
-from typing import Any, Dict, List
+from typing import Any, Dict
 
 import ast
 
-from app.services.analysis_rules.base import BaseAnalysisRule
+from app.interfaces.analyzer import AnalysisContext
+from app.services.analysis_rules.base import BaseAnalysisRule, make_suggestion
+
+
+_UNUSED_IMPORT_MESSAGE = "Importação '{name}' não é utilizada."
 
 
 class ImportAnalysisRule(BaseAnalysisRule):
     """Detects unused imports in code."""
 
     rule_id = "unused_import"
+    node_types = (ast.Import, ast.ImportFrom)
 
-    def _analyze(self, tree: ast.AST, suggestions: List[Dict[str, Any]]) -> None:
+    def begin(self, context: AnalysisContext) -> None:
         imports: Dict[str, int] = {}
-        for node in ast.walk(tree):
-            if isinstance(node, ast.Import):
-                for alias in node.names:
-                    name = alias.asname or alias.name.split(".")[0]
-                    imports[name] = node.lineno
-            elif isinstance(node, ast.ImportFrom):
-                module = node.module or ""
-                for alias in node.names:
-                    name = alias.asname or alias.name
-                    key = f"{module}.{name}" if module else name
-                    imports[key] = node.lineno
-
-        used_names = {
-            node.id
-            for node in ast.walk(tree)
-            if isinstance(node, ast.Name) and isinstance(node.ctx, ast.Load)
-        }
-
+        context.rule_state[self] = imports
+
+    def visit(self, node: Any, context: AnalysisContext) -> None:
+        imports = context.rule_state[self]
+        if type(node) is ast.Import:
+            for alias in node.names:
+                name = alias.asname or alias.name.split(".")[0]
+                imports[name] = node.lineno
+        else:
+            module = node.module or ""
+            for alias in node.names:
+                name = alias.asname or alias.name
+                key = f"{module}.{name}" if module else name
+                imports[key] = node.lineno
+
+    def finalize(self, context: AnalysisContext) -> None:
+        imports = context.rule_state[self]
+        used_names = context.used_names
         for name, lineno in imports.items():
             base_name = name.split(".")[0]
             if base_name not in used_names:
-                suggestions.append(
-                    {
-                        "rule_id": self.rule_id,
-                        "message": f"Importação '{name}' não é utilizada.",
-                        "severity": "warning",
-                        "line": lineno,
-                        "column": None,
-                        "metadata": {"symbol": name},
-                    }
+                context.suggestions.append(
+                    make_suggestion(
+                        self.rule_id,
+                        _UNUSED_IMPORT_MESSAGE.format(name=name),
+                        "warning",
+                        lineno,
+                        metadata={"symbol": name},
+                    )
                 )
-
@@ -2,44 +2,59 @@
 
 from __future__ import annotations
 
-import re
-from typing import Any, Dict, List
+from typing import Any
 
 import ast
 
-from app.services.analysis_rules.base import BaseAnalysisRule
+from app.interfaces.analyzer import AnalysisContext
+from app.services.analysis_rules.base import BaseAnalysisRule, make_suggestion
 
 
-SNAKE_CASE_PATTERN = re.compile(r"^[a-z_][a-z0-9_]*$")
+_NAMING_MESSAGE = "{entity} '{name}' deveria seguir PEP 8 (snake_case)."
+
+
+def _is_snake_case(name: str) -> bool:
+    """
+    Check ``name`` against ``^[a-z_][a-z0-9_]*$`` without the regex engine.
+
+    Names taken from the AST are always valid identifiers (never empty, never
+    starting with a digit), so an ASCII identifier is snake_case exactly when
+    it has no uppercase letters.
+    """
+    return name.isascii() and name.lower() == name
 
 
 class NamingConventionRule(BaseAnalysisRule):
     """Checks PEP 8 naming conventions."""
 
     rule_id = "naming_conventions"
-
-    def _analyze(self, tree: ast.AST, suggestions: List[Dict[str, Any]]) -> None:
-        def add_suggestion(name: str, lineno: int, rule: str, entity: str) -> None:
-            suggestions.append(
-                {
-                    "rule_id": rule,
-                    "message": f"{entity} '{name}' deveria seguir PEP 8 (snake_case).",
-                    "severity": "info",
-                    "line": lineno,
-                    "column": None,
-                    "metadata": {"name": name},
-                }
+    node_types = (ast.FunctionDef, ast.Assign)
+
+    def visit(self, node: Any, context: AnalysisContext) -> None:
+        if type(node) is ast.FunctionDef:
+            name = node.name
+            if not _is_snake_case(name):
+                self._add_suggestion(context, name, node.lineno, "function_naming", "Função")
+        else:
+            for target in node.targets:
+                if type(target) is not ast.Name:
+                    continue
+                name = target.id
+                if not name.startswith("_") and not _is_snake_case(name):
+                    self._add_suggestion(
+                        context, name, target.lineno, "variable_naming", "Variável"
+                    )
+
+    @staticmethod
+    def _add_suggestion(
+        context: AnalysisContext, name: str, lineno: int, rule: str, entity: str
+    ) -> None:
+        context.suggestions.append(
+            make_suggestion(
+                rule,
+                _NAMING_MESSAGE.format(entity=entity, name=name),
+                "info",
+                lineno,
+                metadata={"name": name},
             )
-
-        for node in ast.walk(tree):
-            if isinstance(node, ast.FunctionDef):
-                if not SNAKE_CASE_PATTERN.match(node.name):
-                    add_suggestion(node.name, node.lineno, "function_naming", "Função")
-            elif isinstance(node, ast.Assign):
-                for target in node.targets:
-                    if isinstance(target, ast.Name) and not target.id.startswith("_"):
-                        if not SNAKE_CASE_PATTERN.match(target.id):
-                            add_suggestion(
-                                target.id, target.lineno, "variable_naming", "Variável"
-                            )
-
+        )
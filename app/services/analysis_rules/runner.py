@@ -0,0 +1,79 @@
+"""Runs a fixed set of rules over source code in one parse and one traversal."""
+
+from __future__ import annotations
+
+from typing import List, Sequence
+
+import ast
+
+from app.interfaces.analyzer import AnalysisContext, IAnalysisRule, RawSuggestion
+from app.services.analysis_rules.visitor import CompositeVisitor, build_dispatch_table
+
+
+def _record_name_load(node: ast.Name, context: AnalysisContext) -> None:
+    if type(node.ctx) is ast.Load:
+        context.used_names.add(node.id)
+
+
+class RuleRunner:
+    """Applies a set of rules with a single fused traversal per tree."""
+
+    def __init__(self, rules: Sequence[IAnalysisRule]) -> None:
+        """
+        Initialize the runner.
+
+        Suggestions come out in traversal order, not grouped by rule: handlers
+        run node by node in depth-first source order (rules in list order for
+        the same node), then each rule's ``finalize`` runs in list order, so
+        whole-tree rules such as unused imports/variables always come last.
+
+        Args:
+            rules: Rules to apply; their order breaks ties on the same node
+        """
+        self._rules = list(rules)
+        # Tabelas de despacho montadas uma vez; reutilizadas por toda análise
+        self._dispatch = build_dispatch_table(self._rules)
+        # Nomes lidos são coletados uma vez em context.used_names para todas as regras
+        self._dispatch.setdefault(ast.Name, []).insert(0, _record_name_load)
+        self._leave_dispatch = build_dispatch_table(self._rules, leave=True)
+
+    @property
+    def rules(self) -> List[IAnalysisRule]:
+        return self._rules
+
+    def run(self, code: str) -> List[RawSuggestion]:
+        """
+        Parse code once and apply every rule to the resulting tree.
+
+        Args:
+            code: The source code to analyze
+
+        Returns:
+            Suggestions produced by the rules
+
+        Raises:
+            SyntaxError: If the code cannot be parsed
+        """
+        tree = ast.parse(code)
+        # Só comentários/espaços: nenhuma regra teria o que visitar
+        if not tree.body:
+            return []
+        return self.run_tree(tree)
+
+    def run_tree(self, tree: ast.AST) -> List[RawSuggestion]:
+        """
+        Apply every rule to an already parsed tree.
+
+        Args:
+            tree: Parsed AST tree of the code
+
+        Returns:
+            Suggestions produced by the rules
+        """
+        context = AnalysisContext(suggestions=[])
+        for rule in self._rules:
+            rule.begin(context)
+        CompositeVisitor(self._dispatch, context, self._leave_dispatch).visit(tree)
+        for rule in self._rules:
+            rule.finalize(context)
+        return context.suggestions
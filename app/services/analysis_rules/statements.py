@@ -2,30 +2,32 @@
 
 from __future__ import annotations
 
-from typing import Any, Dict, List
+from typing import Any
 
 import ast
 
-from app.services.analysis_rules.base import BaseAnalysisRule
+from app.interfaces.analyzer import AnalysisContext
+from app.services.analysis_rules.base import BaseAnalysisRule, make_suggestion
+
+
+_PRINT_MESSAGE = "Considere utilizar logging em vez de print para saída em produção."
 
 
 class PrintStatementRule(BaseAnalysisRule):
     """Detects print statements that should use logging."""
 
     rule_id = "print_statement"
-
-    def _analyze(self, tree: ast.AST, suggestions: List[Dict[str, Any]]) -> None:
-        for node in ast.walk(tree):
-            if isinstance(node, ast.Call):
-                if isinstance(node.func, ast.Name) and node.func.id == "print":
-                    suggestions.append(
-                        {
-                            "rule_id": self.rule_id,
-                            "message": "Considere utilizar logging em vez de print para saída em produção.",
-                            "severity": "info",
-                            "line": getattr(node, "lineno", None),
-                            "column": getattr(node, "col_offset", None),
-                            "metadata": {},
-                        }
-                    )
-
+    node_types = (ast.Call,)
+
+    def visit(self, node: Any, context: AnalysisContext) -> None:
+        func = node.func
+        if type(func) is ast.Name and func.id == "print":
+            context.suggestions.append(
+                make_suggestion(
+                    self.rule_id,
+                    _PRINT_MESSAGE,
+                    "info",
+                    node.lineno,
+                    node.col_offset,
+                )
+            )
@@ -2,39 +2,44 @@
 
 from __future__ import annotations
 
-from typing import Any, Dict, List
+from typing import Any, Dict
 
 import ast
 
-from app.services.analysis_rules.base import BaseAnalysisRule
+from app.interfaces.analyzer import AnalysisContext
+from app.services.analysis_rules.base import BaseAnalysisRule, make_suggestion
+
+
+_UNUSED_VARIABLE_MESSAGE = "Variável '{name}' é atribuída mas nunca utilizada."
 
 
 class UnusedVariableRule(BaseAnalysisRule):
     """Detects unused variables in code."""
 
     rule_id = "unused_variable"
+    node_types = (ast.Name,)
 
-    def _analyze(self, tree: ast.AST, suggestions: List[Dict[str, Any]]) -> None:
+    def begin(self, context: AnalysisContext) -> None:
         assigned: Dict[str, int] = {}
-        used_names = set()
+        context.rule_state[self] = assigned
 
-        for node in ast.walk(tree):
-            if isinstance(node, ast.Name) and isinstance(node.ctx, ast.Store):
-                if not node.id.startswith("_"):
-                    assigned[node.id] = node.lineno
-            elif isinstance(node, ast.Name) and isinstance(node.ctx, ast.Load):
-                used_names.add(node.id)
+    def visit(self, node: Any, context: AnalysisContext) -> None:
+        if type(node.ctx) is ast.Store:
+            name = node.id
+            if not name.startswith("_"):
+                context.rule_state[self][name] = node.lineno
 
+    def finalize(self, context: AnalysisContext) -> None:
+        assigned = context.rule_state[self]
+        used_names = context.used_names
         for name, lineno in assigned.items():
             if name not in used_names:
-                suggestions.append(
-                    {
-                        "rule_id": self.rule_id,
-                        "message": f"Variável '{name}' é atribuída mas nunca utilizada.",
-                        "severity": "info",
-                        "line": lineno,
-                        "column": None,
-                        "metadata": {"symbol": name},
-                    }
+                context.suggestions.append(
+                    make_suggestion(
+                        self.rule_id,
+                        _UNUSED_VARIABLE_MESSAGE.format(name=name),
+                        "info",
+                        lineno,
+                        metadata={"symbol": name},
+                    )
                 )
-
@@ -0,0 +1,123 @@
+"""Single-pass AST traversal shared by all analysis rules."""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from typing import Dict, List, Optional, Sequence, Union
+
+import ast
+from ast import AST
+
+from app.interfaces.analyzer import AnalysisContext, IAnalysisRule, NodeHandler
+
+
+DispatchTable = Dict[type, List[NodeHandler]]
+
+
+def build_dispatch_table(
+    rules: Sequence[IAnalysisRule], *, leave: bool = False
+) -> DispatchTable:
+    """
+    Group rule handlers by AST node type.
+
+    Args:
+        rules: Rules whose handlers should be fused into one traversal
+        leave: Group ``leave_handlers`` instead of ``handlers``
+
+    Returns:
+        Mapping of node type to the handlers interested in it, in rule order
+    """
+    table: DispatchTable = defaultdict(list)
+    for rule in rules:
+        handlers = rule.leave_handlers if leave else rule.handlers
+        for node_type, handler in handlers.items():
+            table[node_type].append(handler)
+    return dict(table)
+
+
+class _Leave:
+    """Stack marker that fires leave handlers once a node's subtree is done."""
+
+    __slots__ = ("node", "handlers")
+
+    def __init__(self, node: AST, handlers: List[NodeHandler]) -> None:
+        self.node = node
+        self.handlers = handlers
+
+
+# Nós sem campos (contextos Load/Store/Del, operadores como Add ou And):
+# representam ~1/3 dos nós de uma árvore típica e não têm filhos
+_CHILDLESS_TYPES = frozenset(
+    value
+    for value in vars(ast).values()
+    if isinstance(value, type) and issubclass(value, AST) and not value._fields
+)
+
+# Nós cujos campos não levam a nenhum nó que valha visitar: Name só tem o
+# contexto (sem campos) e os demais só guardam valores/strings. Constant
+# sozinho é ~9% dos nós; as regras que os querem ainda recebem o nó
+_LEAF_TYPES = frozenset({ast.Name, ast.Constant, ast.alias, ast.Global, ast.Nonlocal})
+
+
+class CompositeVisitor:
+    """Walks the tree once, fanning each node out to every interested rule."""
+
+    def __init__(
+        self,
+        dispatch: DispatchTable,
+        context: AnalysisContext,
+        leave_dispatch: Optional[DispatchTable] = None,
+    ) -> None:
+        self._dispatch = dispatch
+        self._leave_dispatch = leave_dispatch or {}
+        self._context = context
+        # Folhas sem handler registrado nem precisam passar pela pilha
+        self._skip = (_CHILDLESS_TYPES | _LEAF_TYPES).difference(
+            self._dispatch, self._leave_dispatch
+        )
+        # Subárvores podadas só valem enquanto nenhum contexto tem handler
+        self._leaves = (
+            _LEAF_TYPES if _CHILDLESS_TYPES <= self._skip else frozenset()
+        )
+
+    def visit(self, node: AST) -> None:
+        # Iterativo (sem recursão nem geradores por nó); mesma ordem do NodeVisitor
+        get_handlers = self._dispatch.get
+        get_leave_handlers = self._leave_dispatch.get
+        context = self._context
+        skip = self._skip
+        leaves = self._leaves
+        stack: List[Union[AST, _Leave]] = [node]
+        pop, append, extend = stack.pop, stack.append, stack.extend
+        while stack:
+            current = pop()
+            if isinstance(current, _Leave):
+                for handler in current.handlers:
+                    handler(current.node, context)
+                continue
+            node_type = type(current)
+            handlers = get_handlers(node_type)
+            if handlers:
+                for handler in handlers:
+                    handler(current, context)
+            leave_handlers = get_leave_handlers(node_type)
+            if leave_handlers:
+                # Empilhado antes dos filhos: só é desempilhado depois deles
+                append(_Leave(current, leave_handlers))
+            if node_type in leaves:
+                continue
+            # Filhos empilhados em ordem reversa (saem na ordem do código),
+            # pulando folhas sem handler
+            for name in reversed(current._fields):
+                value = getattr(current, name, None)
+                if isinstance(value, AST):
+                    if type(value) not in skip:
+                        append(value)
+                elif type(value) is list and value:
+                    extend(
+                        [
+                            item
+                            for item in reversed(value)
+                            if isinstance(item, AST) and type(item) not in skip
+                        ]
+                    )
@@ -2,13 +2,16 @@
 
 from __future__ import annotations
 
-import hashlib
-from typing import Any, Dict, List
+import asyncio
+from concurrent.futures import Executor
+from typing import Any, Dict, List, Mapping, Optional, Sequence
 
 from app.interfaces.analyzer import AnalysisResult, ICodeAnalyzer
 from app.interfaces.cache import ICacheService
 from app.models.schemas import Suggestion
+from app.services.analysis_pool import analyze_in_worker
 from app.services.database_service import AnalysisHistoryService
+from app.services.hashing import hash_code
 
 
 class CodeAnalysisService:
@@ -19,6 +22,7 @@ class CodeAnalysisService:
         analyzer: ICodeAnalyzer,
         cache: ICacheService,
         db_service: AnalysisHistoryService,
+        executor: Optional[Executor] = None,
     ) -> None:
         """
         Initialize the service.
@@ -27,12 +31,16 @@ class CodeAnalysisService:
             analyzer: Code analyzer instance
             cache: Cache service instance
             db_service: Database service instance
+            executor: Optional process pool (see ``analysis_pool``) that runs
+                fresh analyses off the event loop; its workers must apply the
+                same rules as ``analyzer``
         """
         self._analyzer = analyzer
         self._cache = cache
         self._db_service = db_service
+        self._executor = executor
 
-    def analyze_code(
+    async def analyze_code(
         self,
         code: str,
         language_version: str | None = None,
@@ -55,9 +63,9 @@ class CodeAnalysisService:
         code_hash = self._generate_hash(code)
         cache_key = f"analysis:{code_hash}"
 
-        # Try cache first
+        # Try cache first; the Redis client is blocking, so it runs off the loop
         if use_cache:
-            cached = self._cache.get(cache_key)
+            cached = await asyncio.to_thread(self._cache.get, cache_key)
             if cached is not None:
                 suggestions = [self._dict_to_suggestion(item) for item in cached["suggestions"]]
                 return {
@@ -68,11 +76,11 @@ class CodeAnalysisService:
                 }
 
         # Perform analysis
-        result = self._analyzer.analyze(code)
+        result = await self._run_analyzer(code, code_hash)
 
         # Persist to database
         if persist:
-            self._db_service.create(
+            await self._db_service.create(
                 code_hash=code_hash,
                 code_snippet=code,
                 suggestions=result.suggestions,
@@ -87,7 +95,7 @@ class CodeAnalysisService:
                 "suggestions": result.suggestions,
                 "analysis_time_ms": result.analysis_time_ms,
             }
-            self._cache.set(cache_key, response_payload)
+            await asyncio.to_thread(self._cache.set, cache_key, response_payload)
 
         # Convert to response format
         suggestions = [self._dict_to_suggestion(item) for item in result.suggestions]
@@ -98,13 +106,123 @@ class CodeAnalysisService:
             "cached": False,
         }
 
+    async def analyze_many(
+        self,
+        codes: Sequence[str],
+        language_version: str | None = None,
+        *,
+        use_cache: bool = True,
+        persist: bool = True,
+    ) -> List[Dict[str, Any]]:
+        """
+        Analyze several snippets with one cache lookup and one batch insert.
+
+        Args:
+            codes: The source code snippets to analyze
+            language_version: Optional Python version applied to every snippet
+            use_cache: Whether to use cache (default: True)
+            persist: Whether to persist to database (default: True)
+
+        Returns:
+            One result dictionary per snippet, in the same order as ``codes``
+        """
+        code_hashes = [self._generate_hash(code) for code in codes]
+        cache_keys = [f"analysis:{code_hash}" for code_hash in code_hashes]
+        cached_values: List[Optional[Dict[str, Any]]] = (
+            await asyncio.to_thread(self._cache.get_many, cache_keys)
+            if use_cache
+            else [None] * len(codes)
+        )
+
+        # Snippets repetidos no mesmo lote são analisados uma única vez, e os
+        # distintos rodam juntos (pool de processos ou threads)
+        misses: Dict[str, str] = {}
+        for code, code_hash, cached in zip(codes, code_hashes, cached_values):
+            if cached is None:
+                misses.setdefault(code_hash, code)
+        analyses = await asyncio.gather(
+            *(self._run_analyzer(code, code_hash) for code_hash, code in misses.items())
+        )
+        fresh: Dict[str, AnalysisResult] = dict(zip(misses, analyses))
+        if use_cache:
+            for code_hash, result in fresh.items():
+                await asyncio.to_thread(
+                    self._cache.set,
+                    f"analysis:{code_hash}",
+                    {
+                        "code_hash": code_hash,
+                        "suggestions": result.suggestions,
+                        "analysis_time_ms": result.analysis_time_ms,
+                    },
+                )
+
+        results: List[Dict[str, Any]] = []
+        rows: List[Dict[str, Any]] = []
+        for code, code_hash, cached in zip(codes, code_hashes, cached_values):
+            if cached is not None:
+                suggestions = [self._dict_to_suggestion(item) for item in cached["suggestions"]]
+                results.append(
+                    {
+                        "code_hash": cached["code_hash"],
+                        "suggestions": suggestions,
+                        "analysis_time_ms": cached["analysis_time_ms"],
+                        "cached": True,
+                    }
+                )
+                continue
+
+            result = fresh[code_hash]
+            if persist:
+                rows.append(
+                    {
+                        "code_hash": code_hash,
+                        "code_snippet": code,
+                        "suggestions": result.suggestions,
+                        "analysis_time_ms": result.analysis_time_ms,
+                        "language_version": language_version,
+                    }
+                )
+
+            suggestions = [self._dict_to_suggestion(item) for item in result.suggestions]
+            results.append(
+                {
+                    "code_hash": code_hash,
+                    "suggestions": suggestions,
+                    "analysis_time_ms": result.analysis_time_ms,
+                    "cached": False,
+                }
+            )
+
+        # Persist all fresh analyses in a single executemany batch
+        if rows:
+            await self._db_service.bulk_create(rows)
+
+        return results
+
+    async def _run_analyzer(self, code: str, code_hash: str) -> AnalysisResult:
+        """Analyze code on the worker pool if any, else on a worker thread."""
+        # O hash já calculado vira a chave do LRU do analisador, sem hashear de novo
+        if self._executor is None:
+            # Parse + regras são CPU-bound: fora do event loop mesmo sem pool
+            return await asyncio.to_thread(self._analyzer.analyze, code, code_hash)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, analyze_in_worker, code, code_hash
+        )
+
     @staticmethod
     def _generate_hash(code: str) -> str:
-        """Generate SHA-256 hash of code."""
-        return hashlib.sha256(code.encode("utf-8")).hexdigest()
+        """Generate the XXH3-128 hash of code."""
+        return hash_code(code)
 
     @staticmethod
-    def _dict_to_suggestion(data: Dict[str, Any]) -> Suggestion:
-        """Convert dictionary to Suggestion model."""
-        return Suggestion(**data)
+    def _dict_to_suggestion(data: Mapping[str, Any]) -> Suggestion:
+        """
+        Convert dictionary to Suggestion model.
+
+        Suggestions come from our own rules (or the cache they were written
+        to), so they are wrapped without re-running validation; the response
+        model still validates them once at the API edge.
+        """
+        return Suggestion.model_construct(**data)
 
@@ -2,15 +2,17 @@
 
 from __future__ import annotations
 
-import json
+import heapq
 from abc import ABC, abstractmethod
 from datetime import datetime, timedelta, timezone
-from typing import Any, Optional
+from typing import Any, List, Optional, Sequence
 
+import orjson
 import redis
 from redis.exceptions import RedisError
 
-from app.interfaces.cache import ICacheService
+# Chaves não-string são convertidas como no json da stdlib
+_ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS
 
 
 class ICacheBackend(ABC):
@@ -21,6 +23,10 @@ class ICacheBackend(ABC):
         """Retrieve a value from cache."""
         ...
 
+    def get_many(self, keys: Sequence[str]) -> List[Optional[Any]]:
+        """Retrieve several values at once, in the same order as ``keys``."""
+        return [self.get(key) for key in keys]
+
     @abstractmethod
     def set(self, key: str, value: Any, ttl_seconds: Optional[int] = None) -> None:
         """Store a value in cache."""
@@ -40,7 +46,8 @@ class RedisCacheBackend(ICacheBackend):
         self._redis: Optional[redis.Redis] = None
 
         try:
-            client = redis.Redis.from_url(redis_url, decode_responses=True)
+            # Respostas em bytes: orjson decodifica direto, sem passar por str
+            client = redis.Redis.from_url(redis_url, decode_responses=False)
             client.ping()
             self._redis = client
         except RedisError:
@@ -54,17 +61,27 @@ class RedisCacheBackend(ICacheBackend):
             payload = self._redis.get(key)
             if payload is None:
                 return None
-            return json.loads(payload)
+            return orjson.loads(payload)
         except RedisError:
             return None
 
+    def get_many(self, keys: Sequence[str]) -> List[Optional[Any]]:
+        """Retrieve several values from Redis in a single MGET round-trip."""
+        if not self._redis or not keys:
+            return [None] * len(keys)
+        try:
+            payloads = self._redis.mget(keys)
+        except RedisError:
+            return [None] * len(keys)
+        return [None if payload is None else orjson.loads(payload) for payload in payloads]
+
     def set(self, key: str, value: Any, ttl_seconds: Optional[int] = None) -> None:
         """Store value in Redis."""
         if not self._redis:
             return
         ttl = ttl_seconds or self.default_ttl_seconds
         try:
-            self._redis.setex(key, ttl, json.dumps(value))
+            self._redis.setex(key, ttl, orjson.dumps(value, option=_ORJSON_OPTIONS))
         except RedisError:
             pass
 
@@ -84,30 +101,40 @@ class MemoryCacheBackend(ICacheBackend):
     def __init__(self, default_ttl_seconds: int = 3600) -> None:
         self.default_ttl_seconds = default_ttl_seconds
         self._store: dict[str, tuple[datetime, Any]] = {}
-
-    def _cleanup_expired(self) -> None:
-        """Remove expired entries from cache."""
-        now = datetime.now(timezone.utc)
-        expired_keys = [
-            key for key, (expires_at, _) in self._store.items() if expires_at < now
-        ]
-        for key in expired_keys:
-            self._store.pop(key, None)
+        # Min-heap de (expires_at, key); entradas obsoletas (chave regravada)
+        # são descartadas quando chegam ao topo
+        self._expiry_heap: list[tuple[datetime, str]] = []
+
+    def _evict_expired(self, now: datetime) -> None:
+        """Remove entries whose expiry has passed, oldest first."""
+        heap = self._expiry_heap
+        while heap and heap[0][0] < now:
+            expires_at, key = heapq.heappop(heap)
+            payload = self._store.get(key)
+            if payload is not None and payload[0] == expires_at:
+                del self._store[key]
 
     def get(self, key: str) -> Optional[Any]:
         """Retrieve value from memory cache."""
-        self._cleanup_expired()
+        now = datetime.now(timezone.utc)
+        self._evict_expired(now)
         payload = self._store.get(key)
         if not payload:
             return None
-        _, value = payload
+        expires_at, value = payload
+        if expires_at < now:
+            del self._store[key]
+            return None
         return value
 
     def set(self, key: str, value: Any, ttl_seconds: Optional[int] = None) -> None:
         """Store value in memory cache."""
         ttl = ttl_seconds or self.default_ttl_seconds
-        expires_at = datetime.now(timezone.utc) + timedelta(seconds=ttl)
+        now = datetime.now(timezone.utc)
+        self._evict_expired(now)
+        expires_at = now + timedelta(seconds=ttl)
         self._store[key] = (expires_at, value)
+        heapq.heappush(self._expiry_heap, (expires_at, key))
 
     def is_available(self) -> bool:
         """Memory cache is always available."""
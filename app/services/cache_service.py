@@ -1,8 +1,7 @@
 from __future__ import annotations
 
-from typing import Any, Optional
+from typing import Any, List, Optional, Sequence
 
-from app.interfaces.cache import ICacheService
 from app.services.cache.backends import ICacheBackend, MemoryCacheBackend, RedisCacheBackend
 
 
@@ -27,6 +26,16 @@ class CacheService:
         # Fallback to memory cache
         return self._fallback.get(key)
 
+    def get_many(self, keys: Sequence[str]) -> List[Optional[Any]]:
+        # One round-trip to the primary backend; only misses hit the fallback
+        values = self._primary.get_many(keys)
+        missing = [index for index, value in enumerate(values) if value is None]
+        if missing:
+            fallback_values = self._fallback.get_many([keys[index] for index in missing])
+            for index, value in zip(missing, fallback_values):
+                values[index] = value
+        return values
+
     def set(self, key: str, value: Any, ttl_seconds: Optional[int] = None) -> None:
         # Set in both backends for redundancy
         self._primary.set(key, value, ttl_seconds)
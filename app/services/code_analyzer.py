@@ -1,18 +1,24 @@
 from __future__ import annotations
 
-import ast
+import threading
 import time
-from typing import Any, Dict, List, Optional
+from collections import OrderedDict
+from typing import List, Optional
 
-from app.interfaces.analyzer import AnalysisResult
+from app.interfaces.analyzer import AnalysisResult, IAnalysisRule, RawSuggestion
 from app.services.analysis_rules import (
     DocstringRule,
     FunctionMetricsRule,
     ImportAnalysisRule,
     NamingConventionRule,
     PrintStatementRule,
+    RuleRunner,
     UnusedVariableRule,
 )
+from app.services.analysis_rules.base import make_suggestion
+from app.services.hashing import hash_code
+
+RESULT_CACHE_SIZE = 512
 
 
 class CodeAnalyzer:
@@ -20,17 +26,30 @@ class CodeAnalyzer:
 
     def __init__(
         self,
-        rules: Optional[List[Any]] = None,
+        rules: Optional[List[IAnalysisRule]] = None,
+        result_cache_size: int = RESULT_CACHE_SIZE,
     ) -> None:
         """
         Initialize analyzer with rules.
 
         Args:
             rules: List of analysis rules. Defaults to all standard rules.
+            result_cache_size: Number of recent results kept in the in-process
+                LRU; 0 disables it
         """
         self._rules = rules or self._get_default_rules()
+        # One parse and one traversal per analysis, shared by every rule
+        self._runner = RuleRunner(self._rules)
+        # L1 em processo, na frente do cache Redis da camada de serviço. Guarda
+        # resultados e não árvores: um hit já pula o parse, e uma AST ocupa
+        # dezenas de vezes o tamanho do código que a originou
+        self._result_cache: "OrderedDict[str, AnalysisResult]" = OrderedDict()
+        self._result_cache_size = result_cache_size
+        # O analisador é compartilhado entre o event loop e as threads das
+        # tools CrewAI; a análise em si roda fora do lock
+        self._result_cache_lock = threading.Lock()
 
-    def _get_default_rules(self) -> List[Any]:
+    def _get_default_rules(self) -> List[IAnalysisRule]:
         """Get default analysis rules."""
         return [
             ImportAnalysisRule(),
@@ -41,40 +60,68 @@ class CodeAnalyzer:
             PrintStatementRule(),
         ]
 
-    def analyze(self, code: str) -> AnalysisResult:
+    def analyze(self, code: str, code_hash: Optional[str] = None) -> AnalysisResult:
         """
         Analyze code and return results.
 
+        Recently analyzed code is answered from an in-process LRU without
+        parsing; each hit returns a copy, so callers may mutate it freely.
+
         Args:
             code: The source code to analyze
+            code_hash: ``hash_code(code)``, if the caller already computed it;
+                saves hashing the snippet again for the result cache key
 
         Returns:
             AnalysisResult with suggestions and timing information
         """
+        # Código vazio ou só com espaços ASCII não tem o que analisar; outros
+        # espaços Unicode (ex.: U+00A0) são erro de sintaxe e vão ao parser
+        if not code or (code.isspace() and not code.strip(" \t\n\r\f\v")):
+            return AnalysisResult(suggestions=[], analysis_time_ms=0)
+        if self._result_cache_size <= 0:
+            return self._analyze_uncached(code)
+
+        key = code_hash if code_hash is not None else hash_code(code)
+        cache = self._result_cache
+        with self._result_cache_lock:
+            result = cache.get(key)
+            if result is not None:
+                cache.move_to_end(key)
+        if result is None:
+            result = self._analyze_uncached(code)
+            with self._result_cache_lock:
+                cache[key] = result
+                while len(cache) > self._result_cache_size:
+                    cache.popitem(last=False)
+        return AnalysisResult(
+            suggestions=[_copy_suggestion(item) for item in result.suggestions],
+            analysis_time_ms=result.analysis_time_ms,
+        )
+
+    def _analyze_uncached(self, code: str) -> AnalysisResult:
+        """Parse code and run every rule over it."""
         start = time.perf_counter()
-        suggestions: List[Dict[str, Any]] = []
 
         try:
-            tree = ast.parse(code)
+            suggestions = self._runner.run(code)
         except SyntaxError as exc:
-            suggestions.append(
-                {
-                    "rule_id": "syntax_error",
-                    "message": f"Erro de sintaxe: {exc.msg}",
-                    "severity": "error",
-                    "line": exc.lineno,
-                    "column": exc.offset,
-                    "metadata": {},
-                }
-            )
-            return AnalysisResult(
-                suggestions=suggestions,
-                analysis_time_ms=int((time.perf_counter() - start) * 1000),
-            )
-
-        # Apply all rules
-        for rule in self._rules:
-            rule.analyze(tree, suggestions)
+            suggestions = [
+                make_suggestion(
+                    "syntax_error",
+                    f"Erro de sintaxe: {exc.msg}",
+                    "error",
+                    exc.lineno,
+                    exc.offset,
+                )
+            ]
 
         elapsed_ms = int((time.perf_counter() - start) * 1000)
         return AnalysisResult(suggestions=suggestions, analysis_time_ms=elapsed_ms)
+
+
+def _copy_suggestion(suggestion: RawSuggestion) -> RawSuggestion:
+    # Metadados só guardam escalares, então uma cópia rasa de cada nível basta
+    copied = suggestion.copy()
+    copied["metadata"] = dict(suggestion["metadata"])
+    return copied
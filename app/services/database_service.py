@@ -1,42 +1,61 @@
 from __future__ import annotations
 
-from typing import Any, Optional
+from typing import Any, Mapping, Optional, Sequence
 
-from sqlalchemy.orm import Session
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.models.compression import encode_snippet
 from app.models.database import AnalysisHistory
 
 
 class AnalysisHistoryService:
-    def __init__(self, session: Session) -> None:
+    def __init__(self, session: AsyncSession) -> None:
         self.session = session
 
-    def get_by_code_hash(self, code_hash: str) -> Optional[AnalysisHistory]:
-        return (
-            self.session.query(AnalysisHistory)
-            .filter(AnalysisHistory.code_hash == code_hash)
+    async def get_by_code_hash(self, code_hash: str) -> Optional[AnalysisHistory]:
+        result = await self.session.execute(
+            select(AnalysisHistory)
+            .where(AnalysisHistory.code_hash == code_hash)
             .order_by(AnalysisHistory.created_at.desc())
-            .first()
+            # Result.first() não gera LIMIT; sem ele o banco devolve todas as linhas
+            .limit(1)
         )
+        return result.scalars().first()
 
-    def create(
+    async def create(
         self,
         *,
         code_hash: str,
         code_snippet: Optional[str],
-        suggestions: list[dict[str, Any]],
+        suggestions: Sequence[Mapping[str, Any]],
         analysis_time_ms: Optional[int],
         language_version: Optional[str],
     ) -> AnalysisHistory:
-        record = AnalysisHistory(
-            code_hash=code_hash,
-            code_snippet=code_snippet,
-            suggestions=suggestions,
-            analysis_time_ms=analysis_time_ms,
-            language_version=language_version,
+        values = {
+            "code_hash": code_hash,
+            **encode_snippet(code_snippet),
+            "suggestions": suggestions,
+            "analysis_time_ms": analysis_time_ms,
+            "language_version": language_version,
+        }
+        # INSERT ... RETURNING só das colunas geradas pelo banco: id/created_at
+        # voltam sem refresh SELECT e o snippet/sugestões não fazem o caminho de volta
+        stmt = (
+            insert(AnalysisHistory)
+            .values(**values)
+            .returning(AnalysisHistory.id, AnalysisHistory.created_at)
         )
-        self.session.add(record)
-        self.session.commit()
-        self.session.refresh(record)
-        return record
-
+        generated = (await self.session.execute(stmt)).one()
+        await self.session.commit()
+        return AnalysisHistory(id=generated.id, created_at=generated.created_at, **values)
+
+    async def bulk_create(self, rows: Sequence[Mapping[str, Any]]) -> None:
+        """Insert many analyses in one executemany batch and a single commit."""
+        if not rows:
+            return
+        params = [
+            {**row, **encode_snippet(row.get("code_snippet"))} for row in rows
+        ]
+        await self.session.execute(insert(AnalysisHistory), params)
+        await self.session.commit()
@@ -0,0 +1,33 @@
+"""Content hashing used for cache keys and analysis history lookups."""
+
+from __future__ import annotations
+
+import xxhash
+
+# Acima deste tamanho (em caracteres) o texto é codificado e hasheado em
+# blocos, sem materializar uma cópia UTF-8 inteira do snippet
+_STREAMING_THRESHOLD = 1024 * 1024
+_CHUNK_CHARS = 64 * 1024
+
+
+def hash_code(code: str) -> str:
+    """
+    Generate the XXH3-128 hex digest of a code snippet.
+
+    The digest is only used as an opaque deduplication key (cache keys and
+    the ``code_hash`` column), never as a security boundary, so a
+    non-cryptographic hash is sufficient and several times faster.
+
+    Args:
+        code: The source code to hash (as UTF-8)
+
+    Returns:
+        32-character hexadecimal digest
+    """
+    if len(code) <= _STREAMING_THRESHOLD:
+        return xxhash.xxh3_128_hexdigest(code.encode("utf-8"))
+
+    hasher = xxhash.xxh3_128()
+    for start in range(0, len(code), _CHUNK_CHARS):
+        hasher.update(code[start : start + _CHUNK_CHARS].encode("utf-8"))
+    return hasher.hexdigest()
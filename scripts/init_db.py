@@ -12,7 +12,9 @@ from pathlib import Path
 root_dir = Path(__file__).parent.parent
 sys.path.insert(0, str(root_dir))
 
-from app.models.database import Base, engine
+from sqlalchemy import inspect
+
+from app.models.database import Base, create_sync_engine, upgrade_schema
 from app.config import get_settings
 
 
@@ -25,14 +27,21 @@ def init_database():
     print(f"Usando banco: {settings.database_url}")
     
     try:
+        # Script de linha de comando: usa o engine síncrono, sem event loop
+        engine = create_sync_engine()
+
         # Cria todas as tabelas definidas nos modelos
         Base.metadata.create_all(bind=engine)
+        # Bancos já existentes recebem as colunas e índices adicionados depois
+        with engine.begin() as conn:
+            upgrade_schema(conn)
         print("✅ Tabelas criadas com sucesso!")
-        
+
         # Lista as tabelas criadas
-        inspector = engine.dialect.inspector(engine)
+        inspector = inspect(engine)
         tables = inspector.get_table_names()
         print(f"Tabelas criadas: {', '.join(tables)}")
+        engine.dispose()
         
     except Exception as e:
         print(f"❌ Erro ao criar tabelas: {e}")
@@ -5,12 +5,20 @@ CREATE TABLE IF NOT EXISTS analysis_history (
     id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
     code_hash TEXT NOT NULL,
     code_snippet TEXT,
+    code_snippet_zstd BYTEA,
+    code_snippet_compression TEXT,
     suggestions JSONB NOT NULL,
     analysis_time_ms INTEGER,
     language_version VARCHAR(32),
     created_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
 );
 
+-- Bancos criados antes da compressão de snippets
+ALTER TABLE analysis_history ADD COLUMN IF NOT EXISTS code_snippet_zstd BYTEA;
+ALTER TABLE analysis_history ADD COLUMN IF NOT EXISTS code_snippet_compression TEXT;
+
 CREATE INDEX IF NOT EXISTS ix_analysis_history_created_at ON analysis_history (created_at);
-CREATE INDEX IF NOT EXISTS ix_analysis_history_code_hash ON analysis_history USING BTREE (code_hash);
+-- Substitui o índice simples em code_hash: cobre a busca da análise mais recente
+DROP INDEX IF EXISTS ix_analysis_history_code_hash;
+CREATE INDEX IF NOT EXISTS ix_analysis_history_code_hash_created_at ON analysis_history USING BTREE (code_hash, created_at DESC);
 CREATE INDEX IF NOT EXISTS ix_analysis_history_suggestions ON analysis_history USING GIN (suggestions);
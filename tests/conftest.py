@@ -1,12 +1,15 @@
+import asyncio
 import os
 import sys
 from pathlib import Path
-from typing import Any, Generator
+from typing import AsyncGenerator
 
+import fakeredis
 import pytest
-from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
-from sqlalchemy.orm import Session, sessionmaker
+import redis
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import delete
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.pool import StaticPool
 
 # Ensure required environment variables exist before importing application modules
@@ -17,81 +20,81 @@ PROJECT_ROOT = Path(__file__).resolve().parents[1]
 if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
-from app.api.dependencies import get_cache_service, get_db  # noqa: E402
+from app.api.dependencies import Services, get_db  # noqa: E402
+from app.config import get_settings  # noqa: E402
 from app.main import create_app  # noqa: E402
 from app.models import database as database_module  # noqa: E402
-from app.models.database import AnalysisHistory  # noqa: E402
+from app.models.database import AnalysisHistory, create_tables  # noqa: E402
+from app.services.cache_service import CacheService  # noqa: E402
+from app.services.code_analyzer import CodeAnalyzer  # noqa: E402
 
 
-test_engine = create_engine(
-    "sqlite+pysqlite:///:memory:",
-    future=True,
-    connect_args={"check_same_thread": False},
+test_engine = create_async_engine(
+    "sqlite+aiosqlite:///:memory:",
     poolclass=StaticPool,
 )
 
-TestingSessionLocal = sessionmaker(
+TestingSessionLocal = async_sessionmaker(
     bind=test_engine,
+    class_=AsyncSession,
     autoflush=False,
-    autocommit=False,
     expire_on_commit=False,
 )
 
 # Rebind the global engine/session factory used by the application to the test database
 database_module.engine = test_engine
 database_module.SessionLocal = TestingSessionLocal
-database_module.Base.metadata.create_all(bind=test_engine)
 
 
-class InMemoryCacheService:
-    def __init__(self) -> None:
-        self.store: dict[str, dict] = {}
+def pytest_sessionfinish(session: pytest.Session, exitstatus: int) -> None:  # noqa: ARG001
+    # Close the aiosqlite worker thread so the interpreter can exit
+    asyncio.run(test_engine.dispose())
 
-    def get(self, key: str):  # type: ignore[override]
-        return self.store.get(key)
 
-    def set(self, key: str, value: Any, ttl_seconds: int | None = None) -> None:  # noqa: ARG002
-        self.store[key] = value
-
-    def is_available(self) -> bool:
-        return True
+@pytest.fixture
+def anyio_backend() -> str:
+    return "asyncio"
 
 
 @pytest.fixture
-def cache_service() -> InMemoryCacheService:
-    return InMemoryCacheService()
+def cache_service(monkeypatch: pytest.MonkeyPatch) -> CacheService:
+    # Redis em processo: exercita a serialização real do RedisCacheBackend
+    server = fakeredis.FakeServer()
 
+    def _from_url(cls, *args, **kwargs):  # noqa: ANN001, ARG001
+        return fakeredis.FakeRedis(server=server)
 
-@pytest.fixture
-def db_session() -> Generator[Session, None, None]:
-    session = TestingSessionLocal()
-    try:
-        yield session
-    finally:
-        session.query(AnalysisHistory).delete()
-        session.commit()
-        session.close()
+    monkeypatch.setattr(redis.Redis, "from_url", classmethod(_from_url))
+    return CacheService(os.environ["REDIS_URL"], default_ttl_seconds=60)
 
 
 @pytest.fixture
-def client(db_session: Session, cache_service: InMemoryCacheService) -> Generator[TestClient, None, None]:
-    app = create_app()
-
-    def override_get_db():
+async def db_session() -> AsyncGenerator[AsyncSession, None]:
+    await create_tables(test_engine)
+    async with TestingSessionLocal() as session:
         try:
-            yield db_session
+            yield session
         finally:
-            pass
+            await session.execute(delete(AnalysisHistory))
+            await session.commit()
 
-    def override_get_cache():
-        return cache_service
+
+@pytest.fixture
+async def client(
+    db_session: AsyncSession, cache_service: CacheService
+) -> AsyncGenerator[AsyncClient, None]:
+    app = create_app()
+
+    async def override_get_db():
+        yield db_session
 
     app.dependency_overrides[get_db] = override_get_db
-    app.dependency_overrides[get_cache_service] = override_get_cache
+    app.state.services = Services(
+        analyzer=CodeAnalyzer(), cache=cache_service, settings=get_settings()
+    )
 
-    with TestClient(app) as test_client:
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://testserver") as test_client:
         yield test_client
 
     app.dependency_overrides.clear()
-
-
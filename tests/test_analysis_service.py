@@ -0,0 +1,138 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import xxhash
+from sqlalchemy import select
+
+from app.models.database import AnalysisHistory
+from app.services import analysis_service as analysis_service_module
+from app.services import code_analyzer as code_analyzer_module
+from app.services.analysis_pool import analyze_in_worker
+from app.services.analysis_service import CodeAnalysisService
+from app.services.code_analyzer import CodeAnalyzer
+from app.services.database_service import AnalysisHistoryService
+from app.services import hashing
+from app.services.hashing import hash_code
+
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_analyze_many_uses_cache_and_persists_in_one_batch(
+    db_session, cache_service
+) -> None:
+    service = CodeAnalysisService(
+        CodeAnalyzer(), cache_service, AnalysisHistoryService(db_session)
+    )
+    cached_code = "x = 1\n"
+    cache_service.set(
+        f"analysis:{hash_code(cached_code)}",
+        {"code_hash": hash_code(cached_code), "suggestions": [], "analysis_time_ms": 3},
+    )
+    fresh_code = "import os\n"
+
+    results = await service.analyze_many([cached_code, fresh_code, fresh_code])
+
+    assert [item["cached"] for item in results] == [True, False, False]
+    assert results[1]["code_hash"] == hash_code(fresh_code)
+    assert {item.rule_id for item in results[1]["suggestions"]} == {"unused_import"}
+    assert cache_service.get(f"analysis:{hash_code(fresh_code)}") is not None
+
+    rows = (await db_session.execute(select(AnalysisHistory))).scalars().all()
+    assert [row.code_hash for row in rows] == [hash_code(fresh_code)] * 2
+
+
+async def test_fresh_analysis_runs_on_executor(db_session, cache_service) -> None:
+    class RecordingExecutor(ThreadPoolExecutor):
+        def __init__(self, *args, **kwargs) -> None:
+            super().__init__(*args, **kwargs)
+            self.submitted: list = []
+
+        def submit(self, fn, /, *args, **kwargs):  # type: ignore[override]
+            self.submitted.append((fn, args))
+            return super().submit(fn, *args, **kwargs)
+
+    with RecordingExecutor(max_workers=1) as executor:
+        service = CodeAnalysisService(
+            CodeAnalyzer(),
+            cache_service,
+            AnalysisHistoryService(db_session),
+            executor=executor,
+        )
+
+        result = await service.analyze_code("import sys\n", persist=False)
+
+    assert executor.submitted == [
+        (analyze_in_worker, ("import sys\n", hash_code("import sys\n")))
+    ]
+    assert {item.rule_id for item in result["suggestions"]} == {"unused_import"}
+
+
+async def test_inline_analysis_and_cache_calls_run_off_the_event_loop(
+    db_session, cache_service, monkeypatch
+) -> None:
+    loop_thread = threading.get_ident()
+    threads: list = []
+
+    class RecordingAnalyzer(CodeAnalyzer):
+        def analyze(self, code: str, code_hash=None):  # type: ignore[override]
+            threads.append(threading.get_ident())
+            return super().analyze(code, code_hash)
+
+    original_get = cache_service.get
+    monkeypatch.setattr(
+        cache_service, "get", lambda key: threads.append(threading.get_ident()) or original_get(key)
+    )
+    service = CodeAnalysisService(
+        RecordingAnalyzer(), cache_service, AnalysisHistoryService(db_session)
+    )
+
+    await service.analyze_code("z = 3\n", persist=False)
+
+    assert len(threads) == 2
+    assert loop_thread not in threads
+
+
+async def test_cache_miss_hashes_the_snippet_once(db_session, cache_service, monkeypatch) -> None:
+    calls: list = []
+
+    def counting_hash(code: str) -> str:
+        calls.append(code)
+        return hash_code(code)
+
+    monkeypatch.setattr(analysis_service_module, "hash_code", counting_hash)
+    monkeypatch.setattr(code_analyzer_module, "hash_code", counting_hash)
+    service = CodeAnalysisService(CodeAnalyzer(), cache_service, AnalysisHistoryService(db_session))
+
+    await service.analyze_code("w = 4\n", persist=False)
+
+    assert calls == ["w = 4\n"]
+
+
+def test_streamed_hash_matches_hash_of_the_whole_snippet() -> None:
+    # Acima do limite de streaming, com caracteres multibyte em vários blocos
+    line = "x = 'ação ✓ 🐍'\n"
+    code = line * (hashing._STREAMING_THRESHOLD // len(line) + 1)
+    assert len(code) > hashing._STREAMING_THRESHOLD
+
+    assert hash_code(code) == xxhash.xxh3_128_hexdigest(code.encode("utf-8"))
+
+
+async def test_analyze_many_runs_distinct_misses_concurrently(db_session, cache_service) -> None:
+    # Cada análise espera pelas outras: em sequência, a barreira estouraria o timeout
+    barrier = threading.Barrier(2, timeout=5)
+
+    class BarrierAnalyzer(CodeAnalyzer):
+        def analyze(self, code: str, code_hash=None):  # type: ignore[override]
+            barrier.wait()
+            return super().analyze(code, code_hash)
+
+    service = CodeAnalysisService(
+        BarrierAnalyzer(), cache_service, AnalysisHistoryService(db_session)
+    )
+
+    results = await service.analyze_many(["a = 1\n", "b = 2\n", "a = 1\n"], persist=False)
+
+    assert [item["cached"] for item in results] == [False, False, False]
+    assert results[0]["code_hash"] == results[2]["code_hash"]
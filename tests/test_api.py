@@ -1,53 +1,57 @@
-from hashlib import sha256
-
-from fastapi.testclient import TestClient
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import select
 
 from app.models.database import AnalysisHistory
+from app.services.hashing import hash_code
+
 
+pytestmark = pytest.mark.anyio
 
-def test_analyze_code_persists_and_caches(
-    client: TestClient,
+
+async def test_analyze_code_persists_and_caches(
+    client: AsyncClient,
     db_session,
     cache_service,
 ) -> None:
     payload = {"code": "def foo():\n    return 1\n", "language_version": "3.11"}
 
-    response = client.post("/api/v1/analyze-code", json=payload)
+    response = await client.post("/api/v1/analyze-code", json=payload)
 
     assert response.status_code == 200
     body = response.json()
     assert body["cached"] is False
-    assert body["code_hash"] == sha256(payload["code"].encode()).hexdigest()
+    assert body["code_hash"] == hash_code(payload["code"])
     assert isinstance(body["suggestions"], list)
 
     stored = (
-        db_session.query(AnalysisHistory)
-        .filter_by(code_hash=body["code_hash"])
-        .one()
-    )
+        await db_session.execute(
+            select(AnalysisHistory).filter_by(code_hash=body["code_hash"])
+        )
+    ).scalar_one()
     assert stored.code_snippet == payload["code"]
-    assert f"analysis:{body['code_hash']}" in cache_service.store
+    assert cache_service.get(f"analysis:{body['code_hash']}") is not None
 
 
-def test_analyze_code_returns_cached_response(client: TestClient, cache_service) -> None:
+async def test_analyze_code_returns_cached_response(client: AsyncClient, cache_service) -> None:
     payload = {"code": "print('hi')\n", "language_version": "3.11"}
-    code_hash = sha256(payload["code"].encode()).hexdigest()
+    code_hash = hash_code(payload["code"])
     cached_payload = {
         "code_hash": code_hash,
         "suggestions": [],
         "analysis_time_ms": 1,
     }
-    cache_service.store[f"analysis:{code_hash}"] = cached_payload
+    cache_service.set(f"analysis:{code_hash}", cached_payload)
 
-    response = client.post("/api/v1/analyze-code", json=payload)
+    response = await client.post("/api/v1/analyze-code", json=payload)
 
     assert response.status_code == 200
     body = response.json()
     assert body == {**cached_payload, "cached": True}
 
 
-def test_health_endpoint_reports_dependencies(client: TestClient) -> None:
-    response = client.get("/api/v1/health")
+async def test_health_endpoint_reports_dependencies(client: AsyncClient) -> None:
+    response = await client.get("/api/v1/health")
 
     assert response.status_code == 200
     body = response.json()
@@ -55,3 +59,16 @@ def test_health_endpoint_reports_dependencies(client: TestClient) -> None:
     assert body["database"] == "ok"
     assert body["cache"] in {"ok", "fallback"}
 
+
+async def test_health_endpoint_reuses_recent_checks(client: AsyncClient, cache_service, monkeypatch) -> None:
+    from app.api import routes
+
+    monkeypatch.setattr(routes, "_health_results", {})
+    calls = []
+    monkeypatch.setattr(cache_service, "is_available", lambda: calls.append(1) or True)
+
+    first = await client.get("/api/v1/health")
+    second = await client.get("/api/v1/health")
+
+    assert first.json() == second.json()
+    assert len(calls) == 1
@@ -39,3 +39,43 @@ def test_memory_cache_expiration(monkeypatch: pytest.MonkeyPatch) -> None:
 
     assert cache.get("key") is None
 
+
+
+def test_get_many_falls_back_for_missing_keys(monkeypatch: pytest.MonkeyPatch) -> None:
+    def _raise(*args, **kwargs):  # noqa: ANN001, D401
+        raise RedisError("unavailable")
+
+    monkeypatch.setattr(redis.Redis, "from_url", classmethod(_raise))
+
+    cache = CacheService("redis://example:6379/0", default_ttl_seconds=60)
+    cache.set("a", {"value": 1})
+    cache.set("c", {"value": 3})
+
+    assert cache.get_many(["a", "b", "c"]) == [{"value": 1}, None, {"value": 3}]
+
+
+def test_memory_backend_evicts_expired_entries_via_expiry_heap(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    from app.services.cache import backends
+
+    clock = [datetime(2024, 1, 1, tzinfo=timezone.utc)]
+
+    class _FrozenDatetime(datetime):
+        @classmethod
+        def now(cls, tz=None):  # noqa: ANN001, ANN206
+            return clock[0]
+
+    monkeypatch.setattr(backends, "datetime", _FrozenDatetime)
+
+    memory = backends.MemoryCacheBackend(default_ttl_seconds=10)
+    memory.set("short", 1, ttl_seconds=5)
+    memory.set("rewritten", 2, ttl_seconds=5)
+    memory.set("rewritten", 3, ttl_seconds=60)
+
+    clock[0] += timedelta(seconds=30)
+
+    # Reading any key drops every expired entry, but not the rewritten one
+    assert memory.get("missing") is None
+    assert set(memory._store) == {"rewritten"}  # type: ignore[attr-defined]
+    assert memory.get("rewritten") == 3
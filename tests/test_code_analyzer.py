@@ -1,3 +1,19 @@
+import ast
+import re
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.services.analysis_rules import (
+    DocstringRule,
+    FunctionMetricsRule,
+    ImportAnalysisRule,
+    NamingConventionRule,
+    RuleRunner,
+    UnusedVariableRule,
+)
+from app.services.analysis_rules.base import BaseAnalysisRule, make_suggestion
+from app.services.analysis_rules.naming import _is_snake_case
 from app.services.code_analyzer import CodeAnalyzer
 
 
@@ -34,3 +50,227 @@ def CamelCaseFunction():
     assert "print_statement" in rule_ids
     assert "missing_docstring" in rule_ids
 
+
+
+def test_import_and_variable_rules_share_collected_names() -> None:
+    code = """
+import os
+import sys
+
+cwd = os.getcwd()
+copy = cwd
+"""
+
+    result = CodeAnalyzer(rules=[ImportAnalysisRule(), UnusedVariableRule()]).analyze(code)
+
+    assert {(item["rule_id"], item["metadata"]["symbol"]) for item in result.suggestions} == {
+        ("unused_import", "sys"),
+        ("unused_variable", "copy"),
+    }
+
+
+def test_single_rule_matches_fused_traversal() -> None:
+    code = """
+def BadName(x):
+    if x and x > 1:
+        return [i for i in range(x)]
+    return []
+"""
+    rules = [FunctionMetricsRule(), NamingConventionRule(), DocstringRule()]
+
+    fused = CodeAnalyzer(rules=rules).analyze(code).suggestions
+    separate: list = []
+    for rule in rules:
+        rule.analyze(ast.parse(code), separate)
+
+    key = lambda item: (item["rule_id"], item["line"])  # noqa: E731
+    assert sorted(fused, key=key) == sorted(separate, key=key)
+    assert {item["rule_id"] for item in fused} == {"function_naming", "missing_docstring"}
+
+
+def test_nested_function_branches_count_towards_outer_complexity() -> None:
+    inner_branches = "\n".join(f"        if x == {i}:\n            return {i}" for i in range(7))
+    sibling_branches = "\n".join(f"    if x == {i}:\n        return {i}" for i in range(9))
+    code = f"""
+for _ in range(3):
+    if _:
+        pass
+
+def outer(x):
+    if x:
+        pass
+    if not x:
+        pass
+    for _ in range(3):
+        pass
+
+    def inner(x):
+{inner_branches}
+
+    return inner
+
+def sibling(x):
+{sibling_branches}
+"""
+
+    result = CodeAnalyzer(rules=[FunctionMetricsRule()]).analyze(code)
+    complexity = {
+        item["message"].split("'")[1]: item["metadata"]["complexity"]
+        for item in result.suggestions
+        if item["rule_id"] == "high_cyclomatic_complexity"
+    }
+
+    # Desvios no nível do módulo não contam; a função irmã fica abaixo do limite
+    assert complexity == {"outer": 11}
+
+
+def test_repeated_code_is_answered_from_result_cache() -> None:
+    class CountingRule(NamingConventionRule):
+        runs = 0
+
+        def begin(self, context) -> None:  # type: ignore[override]
+            CountingRule.runs += 1
+
+    analyzer = CodeAnalyzer(rules=[CountingRule()])
+
+    first = analyzer.analyze("def BadName():\n    pass\n")
+    first.suggestions[0]["metadata"]["name"] = "mutated"
+    second = analyzer.analyze("def BadName():\n    pass\n")
+
+    assert CountingRule.runs == 1
+    assert second.suggestions[0]["metadata"] == {"name": "BadName"}
+
+
+def test_blank_and_comment_only_code_yield_no_suggestions() -> None:
+    analyzer = CodeAnalyzer()
+
+    assert analyzer.analyze("").suggestions == []
+    assert analyzer.analyze("  \n\t\n").analysis_time_ms == 0
+    assert analyzer.analyze("# só um comentário\n").suggestions == []
+
+
+@pytest.mark.parametrize("code", ["\xa0", "\u3000\n", "\x1c", "\u2028"])
+def test_unicode_only_whitespace_is_still_a_syntax_error(code: str) -> None:
+    result = CodeAnalyzer().analyze(code)
+
+    assert [item["rule_id"] for item in result.suggestions] == ["syntax_error"]
+
+
+@pytest.mark.parametrize(
+    "name",
+    ["snake_case", "_private", "__dunder__", "x1", "CamelCase", "mixedCase", "ALL_CAPS", "ação"],
+)
+def test_is_snake_case_matches_pep8_pattern(name: str) -> None:
+    assert _is_snake_case(name) == bool(re.match(r"^[a-z_][a-z0-9_]*$", name))
+
+
+def test_leaf_pruning_keeps_handled_context_nodes_reachable() -> None:
+    class LoadCountingRule(BaseAnalysisRule):
+        rule_id = "load"
+        node_types = (ast.Load,)
+
+        def visit(self, node, context) -> None:
+            context.suggestions.append(make_suggestion("load", "", "info", None))
+
+    code = "total = price * 2\nprint(total)\n"
+
+    result = CodeAnalyzer(rules=[LoadCountingRule()]).analyze(code)
+
+    expected = sum(type(node) is ast.Load for node in ast.walk(ast.parse(code)))
+    assert len(result.suggestions) == expected
+
+
+def test_result_cache_stays_bounded_under_concurrent_use() -> None:
+    analyzer = CodeAnalyzer(result_cache_size=8)
+    codes = [f"value_{i} = {i}\n" for i in range(64)]
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(analyzer.analyze, codes * 4))
+
+    assert len(results) == len(codes) * 4
+    assert len(analyzer._result_cache) <= 8  # type: ignore[attr-defined]
+
+
+def test_rule_instances_sharing_a_rule_id_keep_separate_state() -> None:
+    branches = "\n".join(f"    if x == {i}:\n        pass" for i in range(11))
+    code = f"def busy(x):\n{branches}\n"
+
+    result = CodeAnalyzer(rules=[FunctionMetricsRule(), FunctionMetricsRule()]).analyze(code)
+
+    assert [
+        item["metadata"]["complexity"]
+        for item in result.suggestions
+        if item["rule_id"] == "high_cyclomatic_complexity"
+    ] == [12, 12]
+
+
+def test_suggestions_follow_traversal_order_with_whole_tree_rules_last() -> None:
+    code = '''import os
+import sys
+
+
+def BadName():
+    print("x")
+    unused = 1
+
+
+import sys
+'''
+
+    result = CodeAnalyzer().analyze(code)
+
+    assert [(item["rule_id"], item["line"]) for item in result.suggestions] == [
+        ("function_naming", 5),
+        ("missing_docstring", 5),
+        ("print_statement", 6),
+        ("unused_import", 1),
+        ("unused_import", 10),
+        ("unused_variable", 7),
+    ]
+
+
+def test_rule_runner_visits_in_source_pre_order_and_prunes_leaves() -> None:
+    events: list = []
+
+    class RecordingRule(BaseAnalysisRule):
+        rule_id = "recording"
+        node_types = (ast.FunctionDef, ast.Return, ast.BinOp, ast.Name, ast.Call)
+
+        @property
+        def leave_handlers(self):
+            return {ast.FunctionDef: lambda node, context: events.append(("leave", node.name))}
+
+        def visit(self, node, context) -> None:
+            events.append((type(node).__name__, getattr(node, "id", None)))
+
+    tree = ast.parse("def f(a):\n    return a + g(1)\n\ndef h():\n    pass\n")
+
+    RuleRunner([RecordingRule()]).run_tree(tree)
+
+    assert events == [
+        ("FunctionDef", None),
+        ("Return", None),
+        ("BinOp", None),
+        ("Name", "a"),
+        ("Call", None),
+        ("Name", "g"),
+        ("leave", "f"),
+        ("FunctionDef", None),
+        ("leave", "h"),
+    ]
+
+
+def test_rules_without_node_types_or_with_legacy_analyze_are_rejected() -> None:
+    with pytest.raises(TypeError, match="node_types"):
+
+        class ForgetfulRule(BaseAnalysisRule):
+            rule_id = "forgetful"
+
+    with pytest.raises(TypeError, match="_analyze"):
+
+        class LegacyRule(BaseAnalysisRule):
+            rule_id = "legacy"
+            node_types = (ast.Call,)
+
+            def _analyze(self, tree, suggestions) -> None:
+                pass
@@ -1,8 +1,19 @@
-from app.models.database import AnalysisHistory
+from datetime import datetime, timezone
+
+import pytest
+import zstandard
+from sqlalchemy import inspect, select, text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.models.compression import SNIPPET_ZSTD_LEVEL, decode_snippet, encode_snippet
+from app.models.database import AnalysisHistory, create_tables
 from app.services.database_service import AnalysisHistoryService
 
 
-def test_create_and_get_analysis_history(db_session) -> None:
+pytestmark = pytest.mark.anyio
+
+
+async def test_create_and_get_analysis_history(db_session) -> None:
     service = AnalysisHistoryService(db_session)
 
     suggestions = [
@@ -16,7 +27,7 @@ def test_create_and_get_analysis_history(db_session) -> None:
         }
     ]
 
-    created = service.create(
+    created = await service.create(
         code_hash="hash",
         code_snippet="print('hello')",
         suggestions=suggestions,
@@ -26,9 +37,116 @@ def test_create_and_get_analysis_history(db_session) -> None:
 
     assert created.id is not None
     assert created.code_hash == "hash"
+    assert created.created_at is not None
 
-    fetched = service.get_by_code_hash("hash")
+    fetched = await service.get_by_code_hash("hash")
     assert fetched is not None
     assert fetched.id == created.id
-    assert len(db_session.query(AnalysisHistory).all()) == 1
+    assert len((await db_session.execute(select(AnalysisHistory))).scalars().all()) == 1
+
+
+async def test_bulk_create_inserts_all_rows(db_session) -> None:
+    service = AnalysisHistoryService(db_session)
+
+    await service.bulk_create(
+        [
+            {
+                "code_hash": f"hash-{index}",
+                "code_snippet": f"x = {index}",
+                "suggestions": [],
+                "analysis_time_ms": 1,
+                "language_version": "3.11",
+            }
+            for index in range(3)
+        ]
+    )
+
+    rows = (await db_session.execute(select(AnalysisHistory))).scalars().all()
+    assert sorted(row.code_hash for row in rows) == ["hash-0", "hash-1", "hash-2"]
+    assert all(row.id is not None for row in rows)
+
+
+async def test_large_snippets_are_stored_compressed(db_session) -> None:
+    service = AnalysisHistoryService(db_session)
+    large_snippet = "value = 1\n" * 1000
+
+    created = await service.create(
+        code_hash="large",
+        code_snippet=large_snippet,
+        suggestions=[],
+        analysis_time_ms=1,
+        language_version=None,
+    )
+
+    assert created.code_snippet is None
+    assert created.code_snippet_compression == "zstd"
+    assert len(created.code_snippet_zstd) < len(large_snippet)
+    assert created.source_code == large_snippet
+
+
+def test_snippet_compression_round_trips_across_chunks() -> None:
+    # Vários blocos de codificação, com caracteres multibyte entre eles
+    snippet = "nome = 'ação'  # ✓\n" * 10_000
+
+    columns = encode_snippet(snippet)
+
+    assert columns["code_snippet"] is None
+    assert decode_snippet(None, columns["code_snippet_zstd"], "zstd") == snippet
+    # Linhas gravadas antes da compressão em streaming continuam legíveis
+    legacy = zstandard.compress(snippet.encode("utf-8"), SNIPPET_ZSTD_LEVEL)
+    assert decode_snippet(None, legacy, "zstd") == snippet
+
+
+async def test_get_by_code_hash_returns_latest_row(db_session) -> None:
+    service = AnalysisHistoryService(db_session)
+    base = {
+        "code_hash": "dup",
+        "suggestions": [],
+        "analysis_time_ms": 1,
+        "language_version": None,
+    }
+    await service.bulk_create(
+        [
+            {**base, "code_snippet": "old", "created_at": datetime(2024, 1, 1, tzinfo=timezone.utc)},
+            {**base, "code_snippet": "new", "created_at": datetime(2024, 6, 1, tzinfo=timezone.utc)},
+        ]
+    )
+
+    fetched = await service.get_by_code_hash("dup")
+
+    assert fetched is not None
+    assert fetched.source_code == "new"
+
+
+async def test_create_tables_upgrades_existing_table() -> None:
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        # Formato da tabela antes da compressão de snippets e do índice composto
+        await conn.execute(
+            text(
+                "CREATE TABLE analysis_history ("
+                "id CHAR(32) PRIMARY KEY, code_hash TEXT NOT NULL, code_snippet TEXT, "
+                "suggestions JSON NOT NULL, analysis_time_ms INTEGER, "
+                "language_version TEXT, created_at DATETIME DEFAULT CURRENT_TIMESTAMP)"
+            )
+        )
+        await conn.execute(
+            text("CREATE INDEX ix_analysis_history_code_hash ON analysis_history (code_hash)")
+        )
+
+    await create_tables(engine)
+    await create_tables(engine)
+
+    def _schema(sync_conn):
+        inspector = inspect(sync_conn)
+        columns = {column["name"] for column in inspector.get_columns("analysis_history")}
+        indexes = {index["name"] for index in inspector.get_indexes("analysis_history")}
+        return columns, indexes
+
+    async with engine.connect() as conn:
+        columns, indexes = await conn.run_sync(_schema)
+    await engine.dispose()
 
+    assert {"code_snippet_zstd", "code_snippet_compression"} <= columns
+    assert "ix_analysis_history_code_hash_created_at" in indexes
+    assert "ix_analysis_history_code_hash" not in indexes